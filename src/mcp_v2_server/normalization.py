@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 import unicodedata
+from functools import lru_cache
 
 SPACE_RE = re.compile(r"\s+")
 HYPHEN_RE = re.compile(r"[‐‑–—−]")
@@ -9,9 +10,24 @@ DOT_RE = re.compile(r"[･]")
 OPEN_PAREN_RE = re.compile(r"[（]")
 CLOSE_PAREN_RE = re.compile(r"[）]")
 SLASH_RE = re.compile(r"[／]")
+# Query terms, titles and paths are short and heavily repeated; full document
+# bodies are normalized once at index build and would only churn the cache.
+NORMALIZE_CACHE_MAX_CHARS = 256
+NORMALIZE_CACHE_MAX_ITEMS = 65536
 
 
 def normalize_text(text: str) -> str:
+    if len(text) <= NORMALIZE_CACHE_MAX_CHARS:
+        return _normalize_text_cached(text)
+    return _normalize_text(text)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_MAX_ITEMS)
+def _normalize_text_cached(text: str) -> str:
+    return _normalize_text(text)
+
+
+def _normalize_text(text: str) -> str:
     out = unicodedata.normalize("NFKC", text)
     out = out.replace("\r\n", "\n").replace("\r", "\n")
     out = HYPHEN_RE.sub("-", out)
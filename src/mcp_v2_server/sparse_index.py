@@ -2,13 +2,20 @@ from __future__ import annotations
 
 import math
 from collections import Counter, OrderedDict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 from .manual_index import list_manual_files, parse_markdown_toc
 from .normalization import normalize_text, split_terms
 from .path_guard import resolve_inside_root
 
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_SCORES_CACHE_MAX_ITEMS = 128
+# Total doc -> score entries kept across all cached BM25 score maps of one index.
+BM25_SCORES_CACHE_MAX_ENTRIES = 131072
+
 
 @dataclass(frozen=True)
 class SparseDoc:
@@ -34,11 +41,39 @@ class SparseIndex:
     postings: dict[str, list[tuple[int, int]]]
     doc_freq: dict[str, int]
     avg_doc_len: float
+    # Derived tables and bounded per-query caches (e.g. BM25 score maps,
+    # substring document frequencies) owned by callers; dropped together with
+    # the index whenever the manuals fingerprint changes.
+    memo: dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
 
     @property
     def total_docs(self) -> int:
         return len(self.docs)
 
+    @property
+    def searchable_texts(self) -> list[str]:
+        """Non-empty normalized texts as one flat column for corpus-wide sweeps."""
+        texts = self.memo.get("searchable_texts")
+        if texts is None:
+            texts = [doc.normalized_text for doc in self.docs if doc.normalized_text]
+            self.memo["searchable_texts"] = texts
+        return texts
+
+    @property
+    def file_title_texts(self) -> dict[tuple[str, str], str]:
+        """NUL-joined normalized section titles per (manual_id, path)."""
+        table = self.memo.get("file_title_texts")
+        if table is None:
+            titles_by_file: dict[tuple[str, str], set[str]] = {}
+            for doc in self.docs:
+                if doc.normalized_title:
+                    titles_by_file.setdefault((doc.manual_id, doc.path), set()).add(doc.normalized_title)
+            # NUL never appears in normalized query terms, so one substring scan
+            # over the joined titles answers "does any title contain the term".
+            table = {key: "\x00".join(sorted(titles)) for key, titles in titles_by_file.items()}
+            self.memo["file_title_texts"] = table
+        return table
+
 
 class SparseIndexStore:
     """Small in-memory cache keyed by manual-id scope."""
@@ -145,12 +180,23 @@ def bm25_scores(
     index: SparseIndex,
     *,
     query_terms: set[str],
-    k1: float = 1.2,
-    b: float = 0.75,
+    k1: float = BM25_K1,
+    b: float = BM25_B,
 ) -> dict[int, float]:
     if not query_terms or index.total_docs == 0:
         return {}
 
+    # Corrective re-passes and PRF score the same term sets against the same
+    # index; keep a small per-index LRU and hand out copies.
+    cache: OrderedDict[tuple[frozenset[str], float, float], dict[int, float]] = index.memo.setdefault(
+        "bm25_scores", OrderedDict()
+    )
+    cache_key = (frozenset(query_terms), float(k1), float(b))
+    cached = cache.get(cache_key)
+    if cached is not None:
+        cache.move_to_end(cache_key)
+        return dict(cached)
+
     n_docs = float(index.total_docs)
     avgdl = max(1.0, float(index.avg_doc_len))
     scores: dict[int, float] = {}
@@ -167,4 +213,10 @@ def bm25_scores(
                 continue
             score = idf * ((float(tf) * (k1 + 1.0)) / denom)
             scores[doc_id] = scores.get(doc_id, 0.0) + score
-    return scores
+    if len(scores) <= BM25_SCORES_CACHE_MAX_ENTRIES:
+        cache[cache_key] = scores
+        cached_entries = sum(len(item) for item in cache.values())
+        while len(cache) > BM25_SCORES_CACHE_MAX_ITEMS or cached_entries > BM25_SCORES_CACHE_MAX_ENTRIES:
+            _, evicted = cache.popitem(last=False)
+            cached_entries -= len(evicted)
+    return dict(scores)
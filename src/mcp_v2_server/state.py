@@ -14,6 +14,7 @@ from .semantic_cache import (
 )
 from .sparse_index import SparseIndexStore
 from .trace_store import TraceStore
+from .vault_file_store import VaultFileStore
 
 
 @dataclass
@@ -24,6 +25,7 @@ class AppState:
     adaptive_stats: AdaptiveStatsWriter
     semantic_cache: SemanticCache
     sparse_index: SparseIndexStore
+    vault_files: VaultFileStore
     read_progress: dict[str, dict[str, int | None]] = field(default_factory=dict)
     manual_root_ids: set[str] = field(default_factory=set)
     manual_ls_seen: bool = False
@@ -47,4 +49,5 @@ def create_state(config: Config | None = None) -> AppState:
         adaptive_stats=AdaptiveStatsWriter(cfg.adaptive_stats_path),
         semantic_cache=semantic_cache,
         sparse_index=SparseIndexStore(cfg.manuals_root),
+        vault_files=VaultFileStore(),
     )
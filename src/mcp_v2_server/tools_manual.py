@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import hashlib
+import heapq
 import time
 import base64
+import bisect
 import math
-import copy
 import re
-from collections import Counter
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path, PurePosixPath
-from typing import Any
+from typing import Any, Collection
 
 from .errors import ToolError, ensure
 from .manual_index import (
@@ -20,7 +22,7 @@ from .manual_index import (
 from .normalization import normalize_text, split_terms
 from .path_guard import normalize_relative_path, resolve_inside_root
 from .reranker import score_query_documents
-from .sparse_index import SparseIndex, bm25_scores
+from .sparse_index import BM25_B, BM25_K1, SparseIndex, bm25_scores
 from .state import AppState
 
 EXCEPTION_WORDS = [
@@ -50,6 +52,8 @@ READ_MAX_SECTIONS = 20
 READ_MAX_CHARS = 12000
 MANUAL_IO_MAX_CHARS_MIN = 256
 MANUAL_IO_MAX_CHARS_MAX = 50000
+SCAN_READ_CHUNK_CHARS = 64 * 1024
+SCAN_READ_BUFFER_BYTES = 64 * 1024
 TOC_SCOPE_HARD_LIMIT = 200
 NUMBER_PATTERN = re.compile(r"\d+")
 NOISE_PATH_TERMS = ("目次", "toc", "index")
@@ -88,6 +92,7 @@ CJK_COMPOUND_SUFFIXES = tuple(
     )
 )
 CODE_TOKEN_RE = re.compile(r"^[a-z]{1,4}\d{2,6}[a-z]?$")
+CODE_TERM_PARTS_RE = re.compile(r"([a-z]+)(\d+)([a-z]?)")
 PRF_TERM_SHAPE_RE = re.compile(r"^[a-z0-9ぁ-んァ-ヶー一-龯々〆ヵヶ]+$")
 PRF_TOP_DOCS = 6
 PRF_MAX_TERMS = 4
@@ -112,9 +117,22 @@ QUERY_DECOMP_COMPARE_KEYWORD_RE = re.compile(
 QUERY_DECOMP_COMPARE_RE = re.compile(r"^\s*(?P<left>.+?)\s*と\s*(?P<right>.+?)\s*$")
 QUERY_DECOMP_VS_RE = re.compile(r"^\s*(?P<left>.+?)\s*(?:vs|VS|Vs|v\.s\.|ＶＳ|ｖｓ)\s*(?P<right>.+?)\s*$")
 QUERY_DECOMP_CASE_RE = re.compile(r"^\s*(?P<left>.+?)\s*の場合の\s*(?P<right>.+?)\s*$")
+# Tried in order; the flag marks patterns whose first sub-query joins both sides.
+QUERY_DECOMP_PATTERNS: tuple[tuple[re.Pattern[str], bool], ...] = (
+    (QUERY_DECOMP_COMPARE_DIFF_RE, False),
+    (QUERY_DECOMP_COMPARE_KEYWORD_RE, False),
+    (QUERY_DECOMP_VS_RE, False),
+    (QUERY_DECOMP_CASE_RE, True),
+    (QUERY_DECOMP_COMPARE_RE, False),
+)
+# Each decomposition pattern needs one of these literals; queries without any skip the cascade.
+QUERY_DECOMP_MARKER_RE = re.compile(r"と|vs|VS|Vs|v\.s\.|ＶＳ|ｖｓ|の場合の")
 KANJI_CHAR_RE = re.compile(r"[一-龯々〆ヵヶ]")
 HIRAGANA_CHAR_RE = re.compile(r"[ぁ-ん]")
 OKURIGANA_TRIM_SUFFIXES = ("い", "み", "り", "き", "し")
+QUERY_TERM_CACHE_MAX_ITEMS = 4096
+NOISE_PATH_CACHE_MAX_ITEMS = 16384
+SUBSTRING_DOC_FREQ_CACHE_MAX_ITEMS = 65536
 REQUIRED_TERMS_MAX_ITEMS = 2
 REQUIRED_TERM_RRF_K = 60
 REQUIRED_TERM_RRF_BASE_WEIGHT = 0.70
@@ -151,19 +169,21 @@ LEXICAL_TOKEN_HIT_COUNT_CAP = 20
 LEXICAL_DEFINITION_TITLE_BONUS = 0.90
 RELAXED_MIN_MATCHED_TOKENS = 2
 RELAXED_MIN_TOKEN_HIT_SUM = 3
-RELAXED_STRONG_SIGNALS = {"phrase", "code_exact", "proximity", "number_context"}
+RELAXED_STRONG_SIGNALS = frozenset({"phrase", "code_exact", "proximity", "number_context"})
 DEFINITION_TITLE_HINTS = tuple(normalize_text(term) for term in ("定義", "基本", "支払事由", "概要"))
 ELIGIBILITY_QUERY_HINTS = tuple(normalize_text(term) for term in ("条件", "要件", "支払", "給付金", "事由"))
 MANUAL_FIND_RERANKER_MIN_CANDIDATES = 2
-CLAIM_GRAPH_STRONG_SIGNALS = {
-    "phrase",
-    "anchor",
-    "number_context",
-    "proximity",
-    "code_exact",
-    "required_term",
-    "required_term_and",
-}
+CLAIM_GRAPH_STRONG_SIGNALS = frozenset(
+    {
+        "phrase",
+        "anchor",
+        "number_context",
+        "proximity",
+        "code_exact",
+        "required_term",
+        "required_term_and",
+    }
+)
 
 
 def _is_exhaustive_query(query: str) -> bool:
@@ -448,13 +468,12 @@ def _apply_cached_request_overrides(
     trace_payload: dict[str, Any],
     requested_expand_scope: bool | None,
 ) -> dict[str, Any]:
-    patched = copy.deepcopy(trace_payload)
-    patched["requested_expand_scope"] = requested_expand_scope
-    applied = patched.get("applied")
+    # Patches in place: cache lookups already return a private deep copy.
+    trace_payload["requested_expand_scope"] = requested_expand_scope
+    applied = trace_payload.get("applied")
     if isinstance(applied, dict):
         applied["requested_expand_scope"] = requested_expand_scope
-        patched["applied"] = applied
-    return patched
+    return trace_payload
 
 
 def _apply_sem_cache_diagnostics_to_trace_payload(
@@ -466,17 +485,16 @@ def _apply_sem_cache_diagnostics_to_trace_payload(
     sem_cache_score: float | None,
     sem_cache_latency_saved_ms: int | None,
 ) -> dict[str, Any]:
-    patched = copy.deepcopy(trace_payload)
-    applied = patched.get("applied")
+    # Patches in place, like _apply_cached_request_overrides.
+    applied = trace_payload.get("applied")
     if not isinstance(applied, dict):
-        return patched
+        return trace_payload
     applied["sem_cache_used"] = sem_cache_used
     applied["sem_cache_hit"] = sem_cache_hit
     applied["sem_cache_mode"] = sem_cache_mode
     applied["sem_cache_score"] = round(sem_cache_score, 4) if sem_cache_score is not None else None
     applied["sem_cache_latency_saved_ms"] = sem_cache_latency_saved_ms
-    patched["applied"] = applied
-    return patched
+    return trace_payload
 
 
 def _cached_summary_is_acceptable(state: AppState, summary: dict[str, Any]) -> bool:
@@ -799,11 +817,60 @@ def _char_offset_from_line(text: str, line_no: int) -> int:
     return offset
 
 
-def _line_from_char_offset(text: str, offset: int) -> int:
-    if not text:
-        return 1
-    bounded = min(max(0, offset), len(text))
-    return text.count("\n", 0, bounded) + 1
+def _read_scan_window(
+    full_path: Path,
+    *,
+    start_line: int | None,
+    start_offset: int,
+    max_chars: int,
+) -> tuple[str, int, int, bool]:
+    # Stream the file in text mode so large manuals are never held in memory
+    # whole; offsets stay in decoded characters with universal newlines, exactly
+    # as read_text() would produce them.
+    consumed = 0
+    line_breaks = 0
+    pending = ""
+    with full_path.open("r", encoding="utf-8", buffering=SCAN_READ_BUFFER_BYTES) as handle:
+        if start_line is not None:
+            remaining_breaks = start_line - 1
+            while remaining_breaks > 0:
+                block = handle.read(SCAN_READ_CHUNK_CHARS)
+                if not block:
+                    raise ToolError("invalid_parameter", "start_line out of range")
+                block_breaks = block.count("\n")
+                if block_breaks < remaining_breaks:
+                    remaining_breaks -= block_breaks
+                    consumed += len(block)
+                    continue
+                pos = -1
+                for _ in range(remaining_breaks):
+                    pos = block.find("\n", pos + 1)
+                consumed += pos + 1
+                pending = block[pos + 1 :]
+                remaining_breaks = 0
+            line_breaks = start_line - 1
+        else:
+            remaining_chars = start_offset
+            while remaining_chars > 0:
+                block = handle.read(min(SCAN_READ_CHUNK_CHARS, remaining_chars))
+                if not block:
+                    raise ToolError("invalid_parameter", "cursor.char_offset out of range")
+                line_breaks += block.count("\n")
+                consumed += len(block)
+                remaining_chars -= len(block)
+
+        parts = [pending[:max_chars]]
+        collected = len(parts[0])
+        has_more = len(pending) > max_chars
+        while not has_more and collected < max_chars:
+            block = handle.read(min(SCAN_READ_CHUNK_CHARS, max_chars - collected))
+            if not block:
+                break
+            parts.append(block)
+            collected += len(block)
+        if not has_more:
+            has_more = bool(handle.read(1))
+    return "".join(parts), consumed, line_breaks + 1, not has_more
 
 
 def _normalize_scan_cursor(cursor: Any) -> dict[str, Any]:
@@ -986,7 +1053,6 @@ def manual_scan(
     full_path = resolve_inside_root(state.config.manuals_root / applied_manual_id, relative_path, must_exist=True)
     ensure(full_path.exists() and full_path.is_file(), "not_found", "manual file not found", {"path": relative_path})
 
-    text = full_path.read_text(encoding="utf-8")
     applied_max_chars = _parse_int_param(
         max_chars,
         name="max_chars",
@@ -995,44 +1061,43 @@ def manual_scan(
         max_value=MANUAL_IO_MAX_CHARS_MAX,
     )
     normalized_cursor = _normalize_scan_cursor(cursor)
+    requested_start_line: int | None = None
+    requested_start_offset = 0
     if start_line is not None:
-        parsed_start_line = _parse_int_param(
+        requested_start_line = _parse_int_param(
             start_line,
             name="start_line",
             default=1,
             min_value=1,
         )
-        applied_start_offset = _char_offset_from_line(text, parsed_start_line)
     elif normalized_cursor.get("char_offset") is not None:
-        applied_start_offset = _parse_int_param(
+        requested_start_offset = _parse_int_param(
             normalized_cursor.get("char_offset"),
             name="cursor.char_offset",
             default=0,
             min_value=0,
         )
     elif normalized_cursor.get("start_line") is not None:
-        parsed_start_line = _parse_int_param(
+        requested_start_line = _parse_int_param(
             normalized_cursor.get("start_line"),
             name="cursor.start_line",
             default=1,
             min_value=1,
         )
-        applied_start_offset = _char_offset_from_line(text, parsed_start_line)
-    else:
-        applied_start_offset = 0
 
-    ensure(applied_start_offset <= len(text), "invalid_parameter", "cursor.char_offset out of range")
-    end_offset = min(len(text), applied_start_offset + applied_max_chars)
-    chunk_text = text[applied_start_offset:end_offset]
-
-    start_line_no = _line_from_char_offset(text, applied_start_offset)
-    if end_offset <= applied_start_offset:
-        end_line_no = start_line_no
+    chunk_text, applied_start_offset, start_line_no, eof = _read_scan_window(
+        full_path,
+        start_line=requested_start_line,
+        start_offset=requested_start_offset,
+        max_chars=applied_max_chars,
+    )
+    end_offset = applied_start_offset + len(chunk_text)
+    if chunk_text:
+        end_line_no = start_line_no + chunk_text.count("\n", 0, len(chunk_text) - 1)
     else:
-        end_line_no = _line_from_char_offset(text, end_offset - 1)
+        end_line_no = start_line_no
 
-    truncated_reason = "none" if end_offset >= len(text) else "max_chars"
-    eof = end_offset >= len(text)
+    truncated_reason = "none" if eof else "max_chars"
 
     return {
         "manual_id": applied_manual_id,
@@ -1213,7 +1278,7 @@ def _relation_for_facet(
     score_norm: float,
 ) -> tuple[str, float] | None:
     signals = set(candidate.get("signals") or [])
-    strong_hit = bool(signals.intersection(CLAIM_GRAPH_STRONG_SIGNALS))
+    strong_hit = not signals.isdisjoint(CLAIM_GRAPH_STRONG_SIGNALS)
     lexical_hit = bool("exact" in signals or strong_hit)
     has_exception = "exceptions" in signals
     compare_hint_hit = _candidate_has_facet_hint(candidate_terms, "compare")
@@ -1318,8 +1383,8 @@ def _build_claim_graph(
         evidence_id = f"ev:{idx}"
         score = float(candidate.get("score") or 0.0)
         score_norm = score_norms[idx - 1] if idx - 1 < len(score_norms) else 0.0
-        signals = sorted(set(candidate.get("signals") or []))
-        signal_set = set(signals)
+        signal_set = set(candidate.get("signals") or [])
+        signals = sorted(signal_set)
         candidate_term_set = _candidate_terms(candidate)
         digest_input = f'{ref.get("manual_id")}|{ref.get("path")}|{ref.get("start_line") or 1}|{",".join(signals)}|{score}'
         evidences.append(
@@ -1452,15 +1517,7 @@ def _build_summary(
     candidate_low_threshold: int,
     file_bias_threshold: float,
 ) -> dict[str, Any]:
-    signal_counts = Counter()
-    file_counts = Counter()
-    for c in candidates:
-        for s in c["signals"]:
-            signal_counts[s] += 1
-        file_counts[c["path"]] += 1
-    total = len(candidates)
-    file_bias = (max(file_counts.values()) / total) if total else 0.0
-    exception_hits = signal_counts.get("exceptions", 0)
+    total, file_bias, _exception_hits = _candidate_metrics(candidates)
     claims = claim_graph.get("claims", [])
     edges = claim_graph.get("edges", [])
     unresolved_search_gap_claim_ids = {
@@ -1571,10 +1628,18 @@ def _candidate_metrics(candidates: list[dict[str, Any]]) -> tuple[int, float, in
     total = len(candidates)
     if total == 0:
         return 0, 0.0, 0
-    file_counts = Counter(item["path"] for item in candidates)
-    file_bias = max(file_counts.values()) / total
-    exception_hits = sum(1 for item in candidates if "exceptions" in item["signals"])
-    return total, file_bias, exception_hits
+    file_counts: dict[str, int] = {}
+    max_file_count = 0
+    exception_hits = 0
+    for item in candidates:
+        path = item["path"]
+        count = file_counts.get(path, 0) + 1
+        file_counts[path] = count
+        if count > max_file_count:
+            max_file_count = count
+        if "exceptions" in item["signals"]:
+            exception_hits += 1
+    return total, max_file_count / total, exception_hits
 
 
 def _should_expand_scope(
@@ -1593,6 +1658,7 @@ def _should_expand_scope(
     )
 
 
+@lru_cache(maxsize=NOISE_PATH_CACHE_MAX_ITEMS)
 def _is_noise_path(path: str) -> bool:
     normalized = normalize_text(Path(path).name)
     return any(term in normalized for term in NOISE_PATH_TERMS)
@@ -1631,7 +1697,7 @@ def _split_cjk_compound_piece(piece: str) -> list[str]:
     return out
 
 
-def _file_query_relevance_score(path: str, normalized_titles: set[str], lexical_terms: list[str]) -> float:
+def _file_query_relevance_score(path: str, title_text: str, lexical_terms: list[str]) -> float:
     normalized_path = normalize_text(path)
     if not normalized_path:
         return 0.0
@@ -1641,14 +1707,15 @@ def _file_query_relevance_score(path: str, normalized_titles: set[str], lexical_
             continue
         if term in normalized_path:
             score += 2.0
-        if normalized_titles and any(term in title for title in normalized_titles):
+        if title_text and term in title_text:
             score += 1.0
     return score
 
 
-def _segment_query_term(term: str) -> list[str]:
+@lru_cache(maxsize=QUERY_TERM_CACHE_MAX_ITEMS)
+def _segment_query_term(term: str) -> tuple[str, ...]:
     if not term:
-        return []
+        return ()
     queue: list[str] = [term]
     # Split once on the linking particle to expose sub-intents in short noun phrases too.
     if "の" in term:
@@ -1680,7 +1747,7 @@ def _segment_query_term(term: str) -> list[str]:
                 for token in _split_cjk_compound_piece(piece):
                     add(token)
 
-    return out
+    return tuple(out)
 
 
 def _expand_lexical_query_terms(query_terms: list[str]) -> tuple[list[str], list[set[str]]]:
@@ -1701,9 +1768,7 @@ def _expand_lexical_query_terms(query_terms: list[str]) -> tuple[list[str], list
         candidate = normalize_text(term)
         if not candidate:
             continue
-        variants = _segment_query_term(candidate)
-        if not variants:
-            variants = [candidate]
+        variants = _segment_query_term(candidate) or (candidate,)
         group: set[str] = set()
         for variant in variants:
             add(variant, group)
@@ -1731,10 +1796,11 @@ def _is_hiragana_char(ch: str) -> bool:
     return bool(ch) and bool(HIRAGANA_CHAR_RE.fullmatch(ch))
 
 
-def _expand_okurigana_variants(term: str) -> list[str]:
+@lru_cache(maxsize=QUERY_TERM_CACHE_MAX_ITEMS)
+def _expand_okurigana_variants(term: str) -> tuple[str, ...]:
     normalized = normalize_text(term)
     if not normalized:
-        return []
+        return ()
 
     out: list[str] = []
     seen: set[str] = set()
@@ -1769,7 +1835,7 @@ def _expand_okurigana_variants(term: str) -> list[str]:
         if len(removed) >= 2 and removed[-1] in OKURIGANA_TRIM_SUFFIXES and _is_kanji_char(removed[-2]):
             add(removed[:-1])
         break
-    return out
+    return tuple(out)
 
 
 def _required_term_pattern_groups(required_terms: list[str]) -> list[list[str]]:
@@ -1777,15 +1843,25 @@ def _required_term_pattern_groups(required_terms: list[str]) -> list[list[str]]:
     for term in required_terms:
         variants = _expand_okurigana_variants(term)
         if variants:
-            out.append(variants)
+            out.append(list(variants))
     return out
 
 
-def _matches_required_term_groups(normalized_text: str, pattern_groups: list[list[str]]) -> bool:
-    if not pattern_groups:
-        return True
-    for group in pattern_groups:
-        if not any(pattern in normalized_text for pattern in group):
+@lru_cache(maxsize=QUERY_TERM_CACHE_MAX_ITEMS)
+def _term_alternation_pattern(group: tuple[str, ...]) -> re.Pattern[str]:
+    # One alternation lets the regex engine test every term in a single scan
+    # instead of one substring search per term.
+    ordered = sorted(set(group), key=lambda value: (-len(value), value))
+    return re.compile("|".join(re.escape(value) for value in ordered))
+
+
+def _compile_required_term_groups(pattern_groups: list[list[str]]) -> list[re.Pattern[str]]:
+    return [_term_alternation_pattern(tuple(group)) for group in pattern_groups if group]
+
+
+def _matches_required_term_groups(normalized_text: str, group_patterns: list[re.Pattern[str]]) -> bool:
+    for pattern in group_patterns:
+        if pattern.search(normalized_text) is None:
             return False
     return True
 
@@ -1804,14 +1880,8 @@ def _required_term_passes(required_terms: list[str]) -> list[tuple[str, list[str
 def _required_term_doc_freq(sparse_index: SparseIndex, pattern_group: list[str]) -> int:
     if sparse_index.total_docs <= 0 or not pattern_group:
         return 0
-    doc_freq = 0
-    for doc in sparse_index.docs:
-        normalized_text = doc.normalized_text
-        if not normalized_text:
-            continue
-        if any(pattern in normalized_text for pattern in pattern_group):
-            doc_freq += 1
-    return doc_freq
+    search = _term_alternation_pattern(tuple(pattern_group)).search
+    return sum(1 for text in sparse_index.searchable_texts if search(text) is not None)
 
 
 def _filter_required_terms_by_df(
@@ -1890,7 +1960,7 @@ def _match_coverage_ratio(matched_terms: set[str], coverage_groups: list[set[str
     for group in coverage_groups:
         if not group:
             continue
-        if matched_terms.intersection(group):
+        if not matched_terms.isdisjoint(group):
             matched_groups += 1
     return matched_groups / max(1, len(coverage_groups))
 
@@ -1899,8 +1969,9 @@ def _is_code_like_term(term: str) -> bool:
     return bool(CODE_TOKEN_RE.fullmatch(term))
 
 
+@lru_cache(maxsize=QUERY_TERM_CACHE_MAX_ITEMS)
 def _compile_code_pattern(term: str) -> re.Pattern[str]:
-    match = re.fullmatch(r"([a-z]+)(\d+)([a-z]?)", term)
+    match = CODE_TERM_PARTS_RE.fullmatch(term)
     if match is None:
         return re.compile(rf"(?<![a-z0-9]){re.escape(term)}(?![a-z0-9])")
     prefix, number, suffix = match.groups()
@@ -1925,76 +1996,99 @@ def _prf_expand_terms(
     bm25 = bm25_scores(sparse_index, query_terms=seed_terms)
     if not bm25:
         return []
-    ranked = sorted(
+    ranked = heapq.nsmallest(
+        PRF_TOP_DOCS,
         ((doc_id, score) for doc_id, score in bm25.items() if score > 0.0),
         key=lambda row: (
             -float(row[1]),
             str(sparse_index.docs[int(row[0])].path),
             int(sparse_index.docs[int(row[0])].start_line),
         ),
-    )[:PRF_TOP_DOCS]
+    )
     if not ranked:
         return []
 
-    total_docs = max(1, sparse_index.total_docs)
+    term_idf = _prf_term_idf_table(sparse_index)
+    avg_doc_len = float(sparse_index.avg_doc_len)
     candidate_gain: dict[str, float] = {}
     for doc_id, score in ranked:
         doc = sparse_index.docs[int(doc_id)]
         base = float(score)
         if base <= 0.0:
             continue
+        length_norm = _bm25_length_norm(doc_len=int(doc.doc_len), avg_doc_len=avg_doc_len)
         for term, tf in doc.term_freq.items():
-            if term in seed_terms or len(term) < 2:
-                continue
-            if _is_code_like_term(term):
-                continue
-            if term.isdigit():
-                continue
-            if not PRF_TERM_SHAPE_RE.fullmatch(term):
+            idf = term_idf.get(term)
+            if idf is None or term in seed_terms or tf <= 0:
                 continue
-            if len(term) <= 2:
-                continue
-            df = int(sparse_index.doc_freq.get(term, 0))
-            if df <= 0:
-                continue
-            if (float(df) / float(total_docs)) > PRF_TERM_MAX_DF_RATIO:
-                continue
-            idf = _idf(total_docs, df)
-            tfw = _bm25_tf_weight(int(tf), doc_len=int(doc.doc_len), avg_doc_len=float(sparse_index.avg_doc_len))
-            gain = base * idf * tfw
+            gain = base * idf * _bm25_tf_weight(float(tf), length_norm)
             if gain <= 0.0:
                 continue
             candidate_gain[term] = candidate_gain.get(term, 0.0) + gain
 
-    expanded = sorted(candidate_gain.items(), key=lambda row: (-row[1], row[0]))
-    return [term for term, _ in expanded[:PRF_MAX_TERMS]]
+    expanded = heapq.nsmallest(PRF_MAX_TERMS, candidate_gain.items(), key=lambda row: (-row[1], row[0]))
+    return [term for term, _ in expanded]
+
+
+def _substring_doc_freq(sparse_index: SparseIndex, terms: Collection[str]) -> dict[str, int]:
+    # Lexical matching is substring-based, so token postings cannot supply these
+    # counts; memoize them per index instead so repeated terms are counted once.
+    cache: dict[str, int] = sparse_index.memo.setdefault("substring_doc_freq", {})
+    missing = [term for term in terms if term not in cache]
+    if missing:
+        if len(cache) + len(missing) > SUBSTRING_DOC_FREQ_CACHE_MAX_ITEMS:
+            cache.clear()
+        texts = sparse_index.searchable_texts
+        for term in missing:
+            cache[term] = sum(1 for text in texts if term in text)
+    return {term: cache[term] for term in terms}
+
+
+def _prf_term_idf_table(sparse_index: SparseIndex) -> dict[str, float]:
+    table = sparse_index.memo.get("prf_term_idf")
+    if table is not None:
+        return table
+    total_docs = max(1, sparse_index.total_docs)
+    table = {}
+    for term, df in sparse_index.doc_freq.items():
+        if len(term) <= 2 or df <= 0:
+            continue
+        if _is_code_like_term(term) or term.isdigit():
+            continue
+        if not PRF_TERM_SHAPE_RE.fullmatch(term):
+            continue
+        if (float(df) / float(total_docs)) > PRF_TERM_MAX_DF_RATIO:
+            continue
+        table[term] = _idf(total_docs, df)
+    sparse_index.memo["prf_term_idf"] = table
+    return table
 
 
 def _idf(total_docs: int, doc_freq: int) -> float:
     return math.log((float(total_docs) + 1.0) / (float(doc_freq) + 1.0)) + 1.0
 
 
-def _bm25_tf_weight(
-    term_freq: int,
+def _bm25_length_norm(
     *,
     doc_len: int,
     avg_doc_len: float,
-    k1: float = 1.2,
-    b: float = 0.75,
+    k1: float = BM25_K1,
+    b: float = BM25_B,
 ) -> float:
-    tf = max(0.0, float(term_freq))
-    if tf <= 0.0:
-        return 0.0
     doc_len_f = max(1.0, float(doc_len))
     avgdl = max(1.0, float(avg_doc_len))
-    denom = tf + (k1 * (1.0 - b + b * (doc_len_f / avgdl)))
-    if denom <= 0.0:
-        return 0.0
-    return (tf * (k1 + 1.0)) / denom
+    return k1 * (1.0 - b + b * (doc_len_f / avgdl))
+
+
+def _bm25_tf_weight(tf: float, length_norm: float, k1: float = BM25_K1) -> float:
+    return (tf * (k1 + 1.0)) / (tf + length_norm)
 
 
 def _candidate_rank_score(item: dict[str, Any]) -> float:
     raw = item.get("_rank_score")
+    # Scores are written as plain floats by this module; check that first.
+    if type(raw) is float:
+        return raw
     if isinstance(raw, (int, float)) and not isinstance(raw, bool):
         return float(raw)
     score = item.get("score")
@@ -2015,14 +2109,27 @@ def _set_candidate_component_scores(
         item["score_fused"] = round(float(score_fused), 4)
 
 
-def _annotate_lexical_candidate_scores(items: list[dict[str, Any]]) -> None:
-    for item in items:
-        score = _candidate_rank_score(item)
-        _set_candidate_component_scores(
-            item,
-            score_lexical=score,
-            score_fused=score,
-        )
+def _insert_sorted_signal(signals: list[str], signal: str) -> None:
+    # Signal lists are always stored sorted and unique, so a bisect insert
+    # matches sorted(set(signals) | {signal}).
+    idx = bisect.bisect_left(signals, signal)
+    if idx == len(signals) or signals[idx] != signal:
+        signals.insert(idx, signal)
+
+
+def _add_candidate_signal(item: dict[str, Any], signal: str, *, shared: bool) -> None:
+    # Shared rows (fused gate rows alias gate-run refs) get fresh lists and ref;
+    # rows owned by the caller are updated in place.
+    ref = item.get("ref")
+    if shared or not isinstance(ref, dict):
+        ref = dict(ref or {})
+        item["ref"] = ref
+    for target in (item, ref):
+        signals = target.get("signals")
+        if shared or not isinstance(signals, list):
+            signals = list(signals or [])
+            target["signals"] = signals
+        _insert_sorted_signal(signals, signal)
 
 
 def _min_max_normalize(value: float, *, min_value: float, max_value: float) -> float:
@@ -2064,11 +2171,12 @@ def _blend_query_decomp_rrf_score(
 
 def _candidate_tie_break_key(item: dict[str, Any]) -> tuple[float, int, float, float, str, int]:
     coverage_raw = item.get("match_coverage")
-    coverage = (
-        max(0.0, float(coverage_raw))
-        if isinstance(coverage_raw, (int, float)) and not isinstance(coverage_raw, bool)
-        else 0.0
-    )
+    if type(coverage_raw) is float:
+        coverage = max(0.0, coverage_raw)
+    elif isinstance(coverage_raw, (int, float)) and not isinstance(coverage_raw, bool):
+        coverage = max(0.0, float(coverage_raw))
+    else:
+        coverage = 0.0
     matched_tokens = item.get("matched_tokens")
     matched_count = len(matched_tokens) if isinstance(matched_tokens, list) else 0
 
@@ -2077,10 +2185,15 @@ def _candidate_tie_break_key(item: dict[str, Any]) -> tuple[float, int, float, f
     token_hits = item.get("token_hits")
     if isinstance(token_hits, dict):
         for value in token_hits.values():
-            if isinstance(value, (int, float)) and not isinstance(value, bool):
+            # Token hits are written as plain ints by this module; check that first.
+            if type(value) is int:
+                hit = max(0.0, float(value))
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
                 hit = max(0.0, float(value))
-                token_hit_sum += hit
-                token_hit_max = max(token_hit_max, hit)
+            else:
+                continue
+            token_hit_sum += hit
+            token_hit_max = max(token_hit_max, hit)
 
     return (
         -coverage,
@@ -2107,30 +2220,49 @@ def _upsert_candidate_with_file_cap(
     file_key: tuple[str, str],
     candidate_row: dict[str, Any],
     per_file_cap: int,
+    sort_keys: dict[str, tuple[float, float, int, float, float, str, int]] | None = None,
 ) -> bool:
+    # sort_keys caches _candidate_sort_key per candidate key; rows must not be
+    # mutated while they are being upserted.
+    if sort_keys is None:
+        sort_keys = {}
     key = _candidate_key(candidate_row)
+    row_sort_key = _candidate_sort_key(candidate_row)
     existing = candidates.get(key)
-    if existing is not None and not _prefer_candidate(candidate_row, existing):
-        return False
+    if existing is not None:
+        existing_sort_key = sort_keys.get(key)
+        if existing_sort_key is None:
+            existing_sort_key = _candidate_sort_key(existing)
+        if not row_sort_key < existing_sort_key:
+            return False
 
     keys_for_file = file_candidate_keys.setdefault(file_key, set())
     if existing is None and key not in keys_for_file and len(keys_for_file) >= per_file_cap:
         valid_keys = [item_key for item_key in keys_for_file if item_key in candidates]
         if not valid_keys:
             keys_for_file.clear()
-            valid_keys = []
-        if not valid_keys:
             candidates[key] = candidate_row
+            sort_keys[key] = row_sort_key
             keys_for_file.add(key)
             return True
-        worst_key = max(valid_keys, key=lambda item_key: _candidate_sort_key(candidates[item_key]))
-        worst_row = candidates.get(worst_key)
-        if worst_row is not None and not _prefer_candidate(candidate_row, worst_row):
+        worst_key = ""
+        worst_sort_key: tuple[float, float, int, float, float, str, int] | None = None
+        for item_key in valid_keys:
+            item_sort_key = sort_keys.get(item_key)
+            if item_sort_key is None:
+                item_sort_key = _candidate_sort_key(candidates[item_key])
+                sort_keys[item_key] = item_sort_key
+            if worst_sort_key is None or item_sort_key > worst_sort_key:
+                worst_key = item_key
+                worst_sort_key = item_sort_key
+        if worst_sort_key is not None and not row_sort_key < worst_sort_key:
             return False
         keys_for_file.remove(worst_key)
         candidates.pop(worst_key, None)
+        sort_keys.pop(worst_key, None)
 
     candidates[key] = candidate_row
+    sort_keys[key] = row_sort_key
     keys_for_file.add(key)
     return True
 
@@ -2145,41 +2277,74 @@ def _effective_scan_hard_cap(configured_cap: int, requested_max_candidates: int)
     return min(configured, budget_scaled)
 
 
+@lru_cache(maxsize=QUERY_TERM_CACHE_MAX_ITEMS)
+def _literal_term_pattern(term: str) -> re.Pattern[str]:
+    return re.compile(re.escape(term))
+
+
 def _term_positions(text: str, term: str, *, limit: int = 8) -> list[int]:
-    if not term:
+    if not term or limit <= 0:
         return []
-    out: list[int] = []
-    start = 0
-    while len(out) < limit:
-        idx = text.find(term, start)
-        if idx < 0:
-            break
-        out.append(idx)
-        start = idx + max(1, len(term))
-    return out
+    return [match.start() for match in islice(_literal_term_pattern(term).finditer(text), limit)]
 
 
 def _min_distance(a: list[int], b: list[int]) -> int | None:
     if not a or not b:
         return None
-    best: int | None = None
-    for left in a:
-        for right in b:
-            dist = abs(left - right)
-            if best is None or dist < best:
-                best = dist
+    # Two-pointer merge over sorted positions: O(|a|+|b|) instead of all pairs.
+    left = sorted(a)
+    right = sorted(b)
+    i = 0
+    j = 0
+    best = abs(left[0] - right[0])
+    while i < len(left) and j < len(right):
+        dist = left[i] - right[j]
+        if dist < 0:
+            best = min(best, -dist)
+            i += 1
+        else:
+            best = min(best, dist)
+            if dist == 0:
+                break
+            j += 1
     return best
 
 
+_COMPACT_MATCH_TRANSLATE = str.maketrans("", "", " -・/()")
+
+
 def _compact_match_text(text: str) -> str:
-    return (
-        text.replace(" ", "")
-        .replace("-", "")
-        .replace("・", "")
-        .replace("/", "")
-        .replace("(", "")
-        .replace(")", "")
-    )
+    return text.translate(_COMPACT_MATCH_TRANSLATE)
+
+
+def _lexical_token_hits(
+    normalized_text: str,
+    term_pairs: list[tuple[str, str]],
+    *,
+    any_term_pattern: re.Pattern[str] | None = None,
+    any_compact_pattern: re.Pattern[str] | None = None,
+) -> dict[str, int]:
+    # term_pairs holds (term, _compact_match_text(term)); the compact text is only
+    # built when some term misses the normalized text. The optional alternation
+    # patterns reject documents that contain no term at all before counting.
+    compact_text: str | None = None
+    if any_term_pattern is not None and any_term_pattern.search(normalized_text) is None:
+        if any_compact_pattern is None:
+            return {}
+        compact_text = _compact_match_text(normalized_text)
+        if any_compact_pattern.search(compact_text) is None:
+            return {}
+    token_hits: dict[str, int] = {}
+    for term, compact_term in term_pairs:
+        raw_count = normalized_text.count(term)
+        if raw_count <= 0 and compact_term:
+            if compact_text is None:
+                compact_text = _compact_match_text(normalized_text)
+            raw_count = compact_text.count(compact_term)
+        count = min(int(raw_count), LEXICAL_TOKEN_HIT_COUNT_CAP)
+        if count > 0:
+            token_hits[term] = count
+    return token_hits
 
 
 def _apply_dynamic_candidate_cutoff(
@@ -2234,8 +2399,7 @@ def _is_strong_relaxed_candidate(item: dict[str, Any]) -> bool:
         return True
     if _candidate_token_hit_sum(item) >= RELAXED_MIN_TOKEN_HIT_SUM:
         return True
-    signals = set(item.get("signals") or [])
-    if signals.intersection(RELAXED_STRONG_SIGNALS):
+    if not RELAXED_STRONG_SIGNALS.isdisjoint(item.get("signals") or []):
         return True
     return False
 
@@ -2286,37 +2450,43 @@ def _apply_file_diversity_rerank(
         MANUAL_FIND_FILE_DIVERSITY_PENALTY_MIN,
         peak_score * MANUAL_FIND_FILE_DIVERSITY_PENALTY_TOP_RATIO,
     )
-    remaining = [dict(item) for item in candidates]
+    # The penalty depends only on how often a path was already selected, so the
+    # best remaining row of a path is always its head. Keep one heap entry per
+    # path and re-push it with the next penalty after each pick.
+    rows_by_path: dict[str, list[tuple[float, tuple[float, int, float, float, str, int], dict[str, Any]]]] = {}
+    for item in candidates:
+        row = dict(item)
+        path = str(row.get("path") or "")
+        rows_by_path.setdefault(path, []).append((_candidate_rank_score(row), _candidate_tie_break_key(row), row))
+    heap: list[tuple[tuple[float, float, int, float, float, str, int], str]] = []
+    for path, rows in rows_by_path.items():
+        rows.sort(key=lambda entry: (-entry[0], *entry[1]))
+        rows.reverse()
+        head_score, head_tie_break, _ = rows[-1]
+        heap.append(((-head_score, *head_tie_break), path))
+    heapq.heapify(heap)
+
     selected: list[dict[str, Any]] = []
     path_counts: dict[str, int] = {}
-
-    while remaining:
-        best_idx = 0
-        best_adjusted = float("-inf")
-        best_penalty = 0.0
-        best_sort_key: tuple[float, float, int, float, float, str, int] | None = None
-        for idx, item in enumerate(remaining):
-            path = str(item.get("path") or "")
-            seen = path_counts.get(path, 0)
-            penalty = float(seen) * penalty_unit
-            adjusted = _candidate_rank_score(item) - penalty
-            sort_key = (-adjusted, *_candidate_tie_break_key(item))
-            if best_sort_key is None or sort_key < best_sort_key:
-                best_idx = idx
-                best_adjusted = adjusted
-                best_penalty = penalty
-                best_sort_key = sort_key
-
-        chosen = remaining.pop(best_idx)
-        chosen["_rank_score"] = float(best_adjusted)
-        chosen["score"] = round(float(best_adjusted), 4)
-        if best_penalty > 0.0:
+    while heap:
+        _, path = heapq.heappop(heap)
+        rows = rows_by_path[path]
+        raw_score, _, chosen = rows.pop()
+        seen = path_counts.get(path, 0)
+        penalty = float(seen) * penalty_unit
+        adjusted = raw_score - penalty
+        chosen["_rank_score"] = float(adjusted)
+        chosen["score"] = round(float(adjusted), 4)
+        if penalty > 0.0:
             rank_explain = list(chosen.get("rank_explain") or [])
-            rank_explain.append(f"file_diversity=-{round(best_penalty, 4)}")
+            rank_explain.append(f"file_diversity=-{round(penalty, 4)}")
             chosen["rank_explain"] = rank_explain
         selected.append(chosen)
-        selected_path = str(chosen.get("path") or "")
-        path_counts[selected_path] = path_counts.get(selected_path, 0) + 1
+        path_counts[path] = seen + 1
+        if rows:
+            next_penalty = float(seen + 1) * penalty_unit
+            next_score, next_tie_break, _ = rows[-1]
+            heapq.heappush(heap, ((-(next_score - next_penalty), *next_tie_break), path))
 
     return selected
 
@@ -2594,15 +2764,7 @@ def _run_find_pass(
             lexical_terms.append(term)
         feedback_term_set = set(feedback_terms)
         query_term_set = set(lexical_terms)
-    term_doc_freq = {term: 0 for term in query_term_set}
-    if query_term_set:
-        for doc in sparse_index.docs:
-            text = doc.normalized_text
-            if not text:
-                continue
-            for term in query_term_set:
-                if term in text:
-                    term_doc_freq[term] = term_doc_freq.get(term, 0) + 1
+    term_doc_freq = _substring_doc_freq(sparse_index, query_term_set)
 
     scan_hard_cap = _effective_scan_hard_cap(
         int(state.config.manual_find_scan_hard_cap),
@@ -2610,6 +2772,7 @@ def _run_find_pass(
     )
     applied_required_terms = list(required_terms or [])
     required_pattern_groups = _required_term_pattern_groups(applied_required_terms)
+    required_group_patterns = _compile_required_term_groups(required_pattern_groups)
     required_terms_added_to_query: list[str] = []
     if applied_required_terms:
         for term in applied_required_terms:
@@ -2620,22 +2783,35 @@ def _run_find_pass(
             term_weights[term] = max(1.05, float(term_weights.get(term, 1.0)))
             required_terms_added_to_query.append(term)
     if required_terms_added_to_query:
-        for term in required_terms_added_to_query:
-            term_doc_freq.setdefault(term, 0)
-        for doc in sparse_index.docs:
-            text = doc.normalized_text
-            if not text:
-                continue
-            for term in required_terms_added_to_query:
-                if term in text:
-                    term_doc_freq[term] = term_doc_freq.get(term, 0) + 1
+        term_doc_freq.update(_substring_doc_freq(sparse_index, required_terms_added_to_query))
+    lexical_term_pairs = [(term, _compact_match_text(term)) for term in lexical_terms]
+    lexical_compact_terms = tuple(compact_term for _, compact_term in lexical_term_pairs if compact_term)
+    lexical_any_pattern = _term_alternation_pattern(tuple(lexical_terms)) if lexical_terms else None
+    lexical_any_compact_pattern = (
+        _term_alternation_pattern(lexical_compact_terms) if lexical_compact_terms else None
+    )
+    term_idf_weights = {
+        term: max(0.0, float(term_weights.get(term, 1.0))) * _idf(total_docs, term_doc_freq.get(term, 0))
+        for term in lexical_terms
+    }
+    # Query-level scoring inputs, hoisted out of the per-document loop.
+    phrase_term_bonuses = [
+        (phrase, phrase_weight * _idf(total_docs, term_doc_freq.get(phrase, 0)))
+        for phrase in normalized_phrase_terms
+        if phrase
+    ]
+    number_term_set = {term for term in lexical_terms if NUMBER_PATTERN.search(term)}
+    eligibility_query = any(hint in query_term_set for hint in ELIGIBILITY_QUERY_HINTS)
+    base_signals = {"exact"}
+    if required_pattern_groups:
+        base_signals.add("required_term")
+        if len(required_pattern_groups) > 1:
+            base_signals.add("required_term_and")
     per_file_cap = max(1, min(int(state.config.manual_find_per_file_candidate_cap), max_candidates))
     prescan_enabled = bool(state.config.manual_find_file_prescan_enabled)
     file_candidate_keys: dict[tuple[str, str], set[str]] = {}
-    file_title_terms: dict[tuple[str, str], set[str]] = {}
-    for doc in sparse_index.docs:
-        key = (doc.manual_id, doc.path)
-        file_title_terms.setdefault(key, set()).add(doc.normalized_title)
+    candidate_sort_keys: dict[str, tuple[float, float, int, float, float, str, int]] = {}
+    file_title_text = sparse_index.file_title_texts if prescan_enabled else {}
 
     files_by_manual: dict[str, list[Any]] = {}
     for manual_id in manual_ids:
@@ -2649,7 +2825,7 @@ def _run_find_pass(
                     r.path not in preferred,
                     -_file_query_relevance_score(
                         r.path,
-                        file_title_terms.get((manual_id, r.path), set()),
+                        file_title_text.get((manual_id, r.path), ""),
                         lexical_terms,
                     ),
                     r.path,
@@ -2660,232 +2836,203 @@ def _run_find_pass(
             files.sort(key=lambda r: (r.path not in preferred, r.path))
         files_by_manual[manual_id] = files
 
+    scan_plan = [(manual_id, row) for manual_id in manual_ids for row in files_by_manual.get(manual_id, [])]
     seen_unscanned: set[tuple[str, str]] = set()
 
-    def append_remaining_unscanned(start_manual_idx: int, start_file_idx: int, reason: str) -> None:
-        for mi in range(start_manual_idx, len(manual_ids)):
-            mid = manual_ids[mi]
-            rows = files_by_manual.get(mid, [])
-            from_idx = start_file_idx if mi == start_manual_idx else 0
-            for row in rows[from_idx:]:
-                key = (mid, row.path)
-                if key in seen_unscanned:
-                    continue
-                seen_unscanned.add(key)
-                unscanned_sections.append({"manual_id": mid, "path": row.path, "reason": reason})
-
-    for manual_idx, manual_id in enumerate(manual_ids):
-        files = files_by_manual.get(manual_id, [])
-        for row_idx, row in enumerate(files):
-            elapsed_ms = int((time.monotonic() - start) * 1000)
-            if elapsed_ms > budget_time_ms:
-                cutoff_reason = "time_budget"
-                append_remaining_unscanned(manual_idx, row_idx, "time_budget")
-                break
-            if len(candidates) >= scan_hard_cap:
-                cutoff_reason = "candidate_cap"
-                append_remaining_unscanned(manual_idx, row_idx, "candidate_cap")
-                break
-            if _is_noise_path(row.path):
+    def append_remaining_unscanned(start_plan_idx: int, reason: str) -> None:
+        for mid, row in scan_plan[start_plan_idx:]:
+            key = (mid, row.path)
+            if key in seen_unscanned:
                 continue
-            scanned_files += 1
-            doc_ids = sparse_index.docs_by_file.get((manual_id, row.path), [])
-            if row.file_type == "md":
-                scanned_nodes += len(doc_ids)
-            elif doc_ids:
-                scanned_nodes += 1
-            else:
-                # Index build may skip unreadable files; treat as warning on query pass.
-                warnings += 1
+            seen_unscanned.add(key)
+            unscanned_sections.append({"manual_id": mid, "path": row.path, "reason": reason})
+
+    for plan_idx, (manual_id, row) in enumerate(scan_plan):
+        elapsed_ms = int((time.monotonic() - start) * 1000)
+        if elapsed_ms > budget_time_ms:
+            cutoff_reason = "time_budget"
+            append_remaining_unscanned(plan_idx, "time_budget")
+            break
+        if len(candidates) >= scan_hard_cap:
+            cutoff_reason = "candidate_cap"
+            append_remaining_unscanned(plan_idx, "candidate_cap")
+            break
+        if _is_noise_path(row.path):
+            continue
+        scanned_files += 1
+        doc_ids = sparse_index.docs_by_file.get((manual_id, row.path), [])
+        if row.file_type == "md":
+            scanned_nodes += len(doc_ids)
+        elif doc_ids:
+            scanned_nodes += 1
+        else:
+            # Index build may skip unreadable files; treat as warning on query pass.
+            warnings += 1
+            continue
+
+        for doc_id in doc_ids:
+            scanned_doc_ids.add(doc_id)
+            doc = sparse_index.docs[doc_id]
+            normalized_text = doc.normalized_text
+            if not normalized_text:
+                continue
+            if required_group_patterns and not _matches_required_term_groups(normalized_text, required_group_patterns):
+                continue
+            token_hits = _lexical_token_hits(
+                normalized_text,
+                lexical_term_pairs,
+                any_term_pattern=lexical_any_pattern,
+                any_compact_pattern=lexical_any_compact_pattern,
+            )
+            if not token_hits:
                 continue
 
-            for doc_id in doc_ids:
-                scanned_doc_ids.add(doc_id)
-                doc = sparse_index.docs[doc_id]
-                normalized_text = doc.normalized_text
-                if not normalized_text:
-                    continue
-                if required_pattern_groups and not _matches_required_term_groups(normalized_text, required_pattern_groups):
-                    continue
-                compact_text = _compact_match_text(normalized_text)
-                token_hits: dict[str, int] = {}
-                for term in lexical_terms:
-                    raw_count = normalized_text.count(term)
-                    if raw_count <= 0:
-                        compact_term = _compact_match_text(term)
-                        if compact_term:
-                            raw_count = compact_text.count(compact_term)
-                    count = min(int(raw_count), LEXICAL_TOKEN_HIT_COUNT_CAP)
-                    if count > 0:
-                        token_hits[term] = count
-                if not token_hits:
-                    continue
+            matched_terms = set(token_hits.keys())
+            length_norm = _bm25_length_norm(doc_len=int(doc.doc_len), avg_doc_len=avg_doc_len)
+            base_score = 0.0
+            for term, count in token_hits.items():
+                base_score += term_idf_weights[term] * _bm25_tf_weight(float(count), length_norm)
+
+            match_coverage_ratio = _match_coverage_ratio(matched_terms, coverage_groups)
+            sparse_coverage_bonus = match_coverage_ratio * sparse_query_coverage_weight
+            coverage_bonus = match_coverage_ratio * coverage_weight
+            phrase_bonus = 0.0
+            for phrase, phrase_term_bonus in phrase_term_bonuses:
+                if phrase in normalized_text:
+                    phrase_bonus += phrase_term_bonus
+
+            number_terms = matched_terms & number_term_set if number_term_set else number_term_set
+            context_present = bool(number_terms) and any(ctx in normalized_text for ctx in NUMBER_CONTEXT_TERMS)
+            number_context_bonus = number_context_bonus_weight if context_present else 0.0
+
+            anchor_terms = [term for term in matched_terms if len(term) >= 4 and term not in number_term_set]
+            proximity_bonus = 0.0
+            if number_terms and anchor_terms:
+                number_positions: list[int] = []
+                for term in sorted(number_terms):
+                    number_positions.extend(_term_positions(normalized_text, term, limit=4))
+                anchor_positions: list[int] = []
+                for term in anchor_terms[:3]:
+                    anchor_positions.extend(_term_positions(normalized_text, term, limit=4))
+                min_distance = _min_distance(anchor_positions, number_positions)
+                if min_distance is not None and min_distance <= PROXIMITY_WINDOW_CHARS:
+                    proximity_bonus = proximity_bonus_near if min_distance <= 40 else proximity_bonus_far
 
-                matched_terms = set(token_hits.keys())
-                base_score = 0.0
-                for term, count in token_hits.items():
-                    term_weight = max(0.0, float(term_weights.get(term, 1.0)))
-                    base_score += (
-                        term_weight
-                        * _idf(total_docs, term_doc_freq.get(term, 0))
-                        * _bm25_tf_weight(
-                        int(count),
-                        doc_len=int(doc.doc_len),
-                        avg_doc_len=avg_doc_len,
-                    )
-                    )
+            code_exact_hits = 0
+            if code_term_patterns:
+                for code_term in matched_terms.intersection(code_term_patterns):
+                    if code_term_patterns[code_term].search(normalized_text):
+                        code_exact_hits += 1
+            code_exact_bonus = float(code_exact_hits) * CODE_EXACT_BONUS
+            prf_support_hits = len(matched_terms.intersection(feedback_term_set)) if feedback_term_set else 0
+            prf_support_bonus = float(min(2, prf_support_hits)) * PRF_TERM_WEIGHT
+            definition_title_bonus = 0.0
+            if eligibility_query and any(hint in doc.normalized_title for hint in DEFINITION_TITLE_HINTS):
+                definition_title_bonus = LEXICAL_DEFINITION_TITLE_BONUS
+
+            length_penalty = max(0.0, (len(normalized_text) - 3000) / 3000.0) * length_penalty_weight
+            score = (
+                base_score
+                + sparse_coverage_bonus
+                + coverage_bonus
+                + phrase_bonus
+                + number_context_bonus
+                + proximity_bonus
+                + code_exact_bonus
+                + prf_support_bonus
+                + definition_title_bonus
+                - length_penalty
+            )
+            if score <= 0:
+                continue
 
-                match_coverage_ratio = _match_coverage_ratio(matched_terms, coverage_groups)
-                sparse_coverage_bonus = match_coverage_ratio * sparse_query_coverage_weight
-                coverage_bonus = match_coverage_ratio * coverage_weight
-                phrase_bonus = 0.0
-                for phrase in normalized_phrase_terms:
-                    if phrase and phrase in normalized_text:
-                        phrase_bonus += phrase_weight * _idf(total_docs, term_doc_freq.get(phrase, 0))
-
-                number_terms = {term for term in matched_terms if NUMBER_PATTERN.search(term)}
-                context_present = bool(number_terms) and any(ctx in normalized_text for ctx in NUMBER_CONTEXT_TERMS)
-                number_context_bonus = number_context_bonus_weight if context_present else 0.0
-
-                anchor_terms = [term for term in matched_terms if len(term) >= 4 and not NUMBER_PATTERN.search(term)]
-                proximity_bonus = 0.0
-                if number_terms and anchor_terms:
-                    number_positions: list[int] = []
-                    for term in sorted(number_terms):
-                        number_positions.extend(_term_positions(normalized_text, term, limit=4))
-                    anchor_positions: list[int] = []
-                    for term in anchor_terms[:3]:
-                        anchor_positions.extend(_term_positions(normalized_text, term, limit=4))
-                    min_distance = _min_distance(anchor_positions, number_positions)
-                    if min_distance is not None and min_distance <= PROXIMITY_WINDOW_CHARS:
-                        proximity_bonus = proximity_bonus_near if min_distance <= 40 else proximity_bonus_far
-
-                code_exact_hits = 0
-                if code_term_patterns:
-                    for code_term, pattern in code_term_patterns.items():
-                        if code_term in matched_terms and pattern.search(normalized_text):
-                            code_exact_hits += 1
-                code_exact_bonus = float(code_exact_hits) * CODE_EXACT_BONUS
-                prf_support_hits = len(matched_terms.intersection(feedback_term_set))
-                prf_support_bonus = float(min(2, prf_support_hits)) * PRF_TERM_WEIGHT
-                definition_title_bonus = 0.0
-                if (
-                    any(hint in doc.normalized_title for hint in DEFINITION_TITLE_HINTS)
-                    and any(hint in query_term_set for hint in ELIGIBILITY_QUERY_HINTS)
-                ):
-                    definition_title_bonus = LEXICAL_DEFINITION_TITLE_BONUS
-
-                length_penalty = max(0.0, (len(normalized_text) - 3000) / 3000.0) * length_penalty_weight
-                score = (
-                    base_score
-                    + sparse_coverage_bonus
-                    + coverage_bonus
-                    + phrase_bonus
-                    + number_context_bonus
-                    + proximity_bonus
-                    + code_exact_bonus
-                    + prf_support_bonus
-                    + definition_title_bonus
-                    - length_penalty
-                )
-                if score <= 0:
-                    continue
+            signals = set(base_signals)
+            if phrase_bonus > 0:
+                signals.add("phrase")
+            if anchor_terms:
+                signals.add("anchor")
+            if context_present:
+                signals.add("number_context")
+            if proximity_bonus > 0:
+                signals.add("proximity")
+            if code_exact_hits > 0:
+                signals.add("code_exact")
+            if prf_support_hits > 0:
+                signals.add("prf")
+            if definition_title_bonus > 0:
+                signals.add("definition_title")
+            if any(word in normalized_text for word in NORMALIZED_EXCEPTION_WORDS) and any(
+                term in FACET_HINTS["exceptions"] or term in NORMALIZED_EXCEPTION_WORDS
+                for term in matched_terms
+            ):
+                signals.add("exceptions")
 
-                signals: set[str] = {"exact"}
-                if required_pattern_groups:
-                    signals.add("required_term")
-                    if len(required_pattern_groups) > 1:
-                        signals.add("required_term_and")
-                if phrase_bonus > 0:
-                    signals.add("phrase")
-                if anchor_terms:
-                    signals.add("anchor")
-                if context_present:
-                    signals.add("number_context")
-                if proximity_bonus > 0:
-                    signals.add("proximity")
-                if code_exact_hits > 0:
-                    signals.add("code_exact")
-                if prf_support_hits > 0:
-                    signals.add("prf")
-                if definition_title_bonus > 0:
-                    signals.add("definition_title")
-                if any(word in normalized_text for word in NORMALIZED_EXCEPTION_WORDS) and any(
-                    term in FACET_HINTS["exceptions"] or term in NORMALIZED_EXCEPTION_WORDS
-                    for term in matched_terms
-                ):
-                    signals.add("exceptions")
-
-                matched_tokens = sorted(matched_terms, key=lambda term: (-token_hits.get(term, 0), term))
-                rank_explain: list[str] = []
-                rank_explain.append(f"base={round(base_score, 4)}")
-                if required_pattern_groups:
-                    rank_explain.append(f"required_terms={len(required_pattern_groups)}")
-                if sparse_coverage_bonus > 0:
-                    rank_explain.append(f"sparse_coverage={round(sparse_coverage_bonus, 4)}")
-                rank_explain.append(f"coverage={round(coverage_bonus, 4)}")
-                if phrase_bonus > 0:
-                    rank_explain.append(f"phrase={round(phrase_bonus, 4)}")
-                if number_context_bonus > 0:
-                    rank_explain.append(f"number_context={round(number_context_bonus, 4)}")
-                if proximity_bonus > 0:
-                    rank_explain.append(f"proximity={round(proximity_bonus, 4)}")
-                if code_exact_bonus > 0:
-                    rank_explain.append(f"code_exact={round(code_exact_bonus, 4)}")
-                if prf_support_bonus > 0:
-                    rank_explain.append(f"prf_support={round(prf_support_bonus, 4)}")
-                if definition_title_bonus > 0:
-                    rank_explain.append(f"definition_title={round(definition_title_bonus, 4)}")
-                if length_penalty > 0:
-                    rank_explain.append(f"length_penalty={round(length_penalty, 4)}")
-
-                item = {
-                    "ref": {
-                        "target": "manual",
-                        "manual_id": manual_id,
-                        "path": row.path,
-                        "start_line": doc.start_line,
-                        "json_path": None,
-                        "title": doc.title,
-                        "signals": sorted(signals),
-                    },
+            matched_tokens = sorted(matched_terms, key=lambda term: (-token_hits.get(term, 0), term))
+            rank_explain_parts: list[tuple[str, float | int]] = [("base", base_score)]
+            if required_pattern_groups:
+                rank_explain_parts.append(("required_terms", len(required_pattern_groups)))
+            if sparse_coverage_bonus > 0:
+                rank_explain_parts.append(("sparse_coverage", sparse_coverage_bonus))
+            rank_explain_parts.append(("coverage", coverage_bonus))
+            if phrase_bonus > 0:
+                rank_explain_parts.append(("phrase", phrase_bonus))
+            if number_context_bonus > 0:
+                rank_explain_parts.append(("number_context", number_context_bonus))
+            if proximity_bonus > 0:
+                rank_explain_parts.append(("proximity", proximity_bonus))
+            if code_exact_bonus > 0:
+                rank_explain_parts.append(("code_exact", code_exact_bonus))
+            if prf_support_bonus > 0:
+                rank_explain_parts.append(("prf_support", prf_support_bonus))
+            if definition_title_bonus > 0:
+                rank_explain_parts.append(("definition_title", definition_title_bonus))
+            if length_penalty > 0:
+                rank_explain_parts.append(("length_penalty", length_penalty))
+
+            item = {
+                "ref": {
+                    "target": "manual",
+                    "manual_id": manual_id,
                     "path": row.path,
                     "start_line": doc.start_line,
-                    "reason": None,
+                    "json_path": None,
+                    "title": doc.title,
                     "signals": sorted(signals),
-                    "_rank_score": float(score),
-                    "score": round(score, 4),
-                    "conflict_with": [],
-                    "gap_hint": None,
-                    "matched_tokens": matched_tokens,
-                    "token_hits": {term: token_hits.get(term, 0) for term in matched_tokens},
-                    "match_coverage": round(match_coverage_ratio, 4),
-                    "rank_explain": rank_explain,
-                    "_rerank_text": _candidate_rerank_text(
-                        title=str(doc.title or ""),
-                        raw_text=str(doc.raw_text or ""),
-                        max_chars=reranker_max_chars,
-                    ),
-                }
-                if applied_required_terms:
-                    item["required_terms"] = list(applied_required_terms)
-                inserted = _upsert_candidate_with_file_cap(
-                    candidates=candidates,
-                    file_candidate_keys=file_candidate_keys,
-                    file_key=(manual_id, row.path),
-                    candidate_row=item,
-                    per_file_cap=per_file_cap,
-                )
-                if inserted and len(candidates) >= scan_hard_cap:
-                    cutoff_reason = "candidate_cap"
-                    append_remaining_unscanned(manual_idx, row_idx, "candidate_cap")
-                    break
-            if cutoff_reason:
+                },
+                "path": row.path,
+                "start_line": doc.start_line,
+                "reason": None,
+                "signals": sorted(signals),
+                "_rank_score": float(score),
+                "score": round(score, 4),
+                "conflict_with": [],
+                "gap_hint": None,
+                "matched_tokens": matched_tokens,
+                "token_hits": {term: token_hits.get(term, 0) for term in matched_tokens},
+                "match_coverage": round(match_coverage_ratio, 4),
+                "_rank_explain_parts": rank_explain_parts,
+                "_doc_id": doc_id,
+            }
+            if applied_required_terms:
+                item["required_terms"] = list(applied_required_terms)
+            inserted = _upsert_candidate_with_file_cap(
+                candidates=candidates,
+                file_candidate_keys=file_candidate_keys,
+                file_key=(manual_id, row.path),
+                candidate_row=item,
+                per_file_cap=per_file_cap,
+                sort_keys=candidate_sort_keys,
+            )
+            if inserted and len(candidates) >= scan_hard_cap:
+                cutoff_reason = "candidate_cap"
+                append_remaining_unscanned(plan_idx, "candidate_cap")
                 break
         if cutoff_reason:
             break
 
-    ordered_primary = sorted(
+    # Only the first max_candidates primary rows can survive either branch below.
+    ordered_primary = heapq.nsmallest(
+        max_candidates,
         candidates.values(),
         key=_candidate_sort_key,
     )
@@ -2918,26 +3065,21 @@ def _run_find_pass(
             normalized_text = doc.normalized_text
             if not normalized_text:
                 continue
-            if required_pattern_groups and not _matches_required_term_groups(normalized_text, required_pattern_groups):
+            if required_group_patterns and not _matches_required_term_groups(normalized_text, required_group_patterns):
                 continue
-            compact_text = _compact_match_text(normalized_text)
-            token_hits: dict[str, int] = {}
-            for term in lexical_terms:
-                raw_count = normalized_text.count(term)
-                if raw_count <= 0:
-                    compact_term = _compact_match_text(term)
-                    if compact_term:
-                        raw_count = compact_text.count(compact_term)
-                count = min(int(raw_count), LEXICAL_TOKEN_HIT_COUNT_CAP)
-                if count > 0:
-                    token_hits[term] = count
+            token_hits = _lexical_token_hits(
+                normalized_text,
+                lexical_term_pairs,
+                any_term_pattern=lexical_any_pattern,
+                any_compact_pattern=lexical_any_compact_pattern,
+            )
             if not token_hits:
                 continue
             matched_terms = set(token_hits.keys())
             code_exact_hits = 0
             if code_term_patterns:
-                for code_term, pattern in code_term_patterns.items():
-                    if code_term in matched_terms and pattern.search(normalized_text):
+                for code_term in matched_terms.intersection(code_term_patterns):
+                    if code_term_patterns[code_term].search(normalized_text):
                         code_exact_hits += 1
             code_exact_bonus = float(code_exact_hits) * CODE_EXACT_BONUS
             scaled_score = round((float(raw_score) * exploration_score_scale) + code_exact_bonus, 4)
@@ -2955,13 +3097,13 @@ def _run_find_pass(
             ):
                 signals.add("exceptions")
             matched_tokens = sorted(matched_terms, key=lambda term: (-token_hits.get(term, 0), term))
-            exploration_rank_explain = [
-                f"exploration_bm25={round(float(raw_score), 4)}",
-                f"exploration_scale={round(exploration_score_scale, 4)}",
-                f"code_exact={round(code_exact_bonus, 4)}",
+            exploration_rank_explain_parts: list[tuple[str, float | int]] = [
+                ("exploration_bm25", float(raw_score)),
+                ("exploration_scale", exploration_score_scale),
+                ("code_exact", code_exact_bonus),
             ]
             if required_pattern_groups:
-                exploration_rank_explain.insert(0, f"required_terms={len(required_pattern_groups)}")
+                exploration_rank_explain_parts.insert(0, ("required_terms", len(required_pattern_groups)))
             item = {
                 "ref": {
                     "target": "manual",
@@ -2983,12 +3125,8 @@ def _run_find_pass(
                 "matched_tokens": matched_tokens,
                 "token_hits": {term: token_hits.get(term, 0) for term in matched_tokens},
                 "match_coverage": round(_match_coverage_ratio(matched_terms, coverage_groups), 4),
-                "rank_explain": exploration_rank_explain,
-                "_rerank_text": _candidate_rerank_text(
-                    title=str(doc.title or ""),
-                    raw_text=str(doc.raw_text or ""),
-                    max_chars=reranker_max_chars,
-                ),
+                "_rank_explain_parts": exploration_rank_explain_parts,
+                "_doc_id": doc_id,
             }
             if applied_required_terms:
                 item["required_terms"] = list(applied_required_terms)
@@ -3004,7 +3142,8 @@ def _run_find_pass(
             max(exploration_min_candidates, int(math.ceil(max_candidates * exploration_ratio))),
         )
         primary_quota = max(0, max_candidates - exploration_quota)
-        exploration_sorted = sorted(
+        exploration_sorted = heapq.nsmallest(
+            max_candidates,
             exploration_pool,
             key=_candidate_sort_key,
         )
@@ -3013,26 +3152,31 @@ def _run_find_pass(
             combined.extend(ordered_primary[primary_quota : primary_quota + (max_candidates - len(combined))])
         if len(combined) < max_candidates:
             combined.extend(exploration_sorted[exploration_quota : exploration_quota + (max_candidates - len(combined))])
-        dedup: dict[str, dict[str, Any]] = {}
-        for item in combined:
-            key = _candidate_key(item)
-            prev = dedup.get(key)
-            if prev is None or _prefer_candidate(item, prev):
-                dedup[key] = item
-        ordered = sorted(
-            dedup.values(),
-            key=_candidate_sort_key,
-        )
+        # Exploration rows skip every key already in candidates, so combined has no duplicates.
+        ordered = sorted(combined, key=_candidate_sort_key)
     else:
         ordered = ordered_primary
 
     ordered = ordered[:max_candidates]
-    _annotate_lexical_candidate_scores(ordered)
+    # Candidates carry raw rank_explain parts and their doc id while scanning;
+    # only the rows that survive the cap are formatted.
     for item in ordered:
-        score_fused = item.get("score_fused")
-        if not isinstance(score_fused, (int, float)) or isinstance(score_fused, bool):
-            score_fused = _candidate_rank_score(item)
-        item["score"] = round(float(score_fused), 4)
+        rank_explain_parts = item.pop("_rank_explain_parts", None)
+        if rank_explain_parts is not None:
+            item["rank_explain"] = [f"{label}={round(value, 4)}" for label, value in rank_explain_parts]
+        doc_id = item.pop("_doc_id", None)
+        if doc_id is not None:
+            doc = sparse_index.docs[doc_id]
+            item["_rerank_text"] = _candidate_rerank_text(
+                title=str(doc.title or ""),
+                raw_text=str(doc.raw_text or ""),
+                max_chars=reranker_max_chars,
+            )
+        # A lexical pass has a single score stage, so all three views agree.
+        score = round(_candidate_rank_score(item), 4)
+        item["score"] = score
+        item["score_lexical"] = score
+        item["score_fused"] = score
     return ordered, scanned_files, scanned_nodes, warnings, cutoff_reason, unscanned_sections, index_rebuilt, index_docs
 
 
@@ -3042,59 +3186,20 @@ def _query_decomp_subqueries(query: str, *, max_sub_queries: int) -> list[str]:
     if not base:
         return []
     out = [base]
-    match = QUERY_DECOMP_COMPARE_DIFF_RE.match(base)
-    if match is not None:
-        left = (match.group("left") or "").strip()
-        right = (match.group("right") or "").strip()
-        for sub in (left, right):
-            if sub and sub not in out:
-                out.append(sub)
-            if len(out) >= cap:
-                break
-        return out[:cap]
-
-    match = QUERY_DECOMP_COMPARE_KEYWORD_RE.match(base)
-    if match is not None:
-        left = (match.group("left") or "").strip()
-        right = (match.group("right") or "").strip()
-        for sub in (left, right):
-            if sub and sub not in out:
-                out.append(sub)
-            if len(out) >= cap:
-                break
-        return out[:cap]
-
-    match = QUERY_DECOMP_VS_RE.match(base)
-    if match is not None:
-        left = (match.group("left") or "").strip()
-        right = (match.group("right") or "").strip()
-        for sub in (left, right):
-            if sub and sub not in out:
-                out.append(sub)
-            if len(out) >= cap:
-                break
-        return out[:cap]
-
-    match = QUERY_DECOMP_CASE_RE.match(base)
-    if match is not None:
-        left = (match.group("left") or "").strip()
-        right = (match.group("right") or "").strip()
-        for sub in (f"{left} {right}".strip(), right):
-            if sub and sub not in out:
-                out.append(sub)
-            if len(out) >= cap:
-                break
-        return out[:cap]
-
-    match = QUERY_DECOMP_COMPARE_RE.match(base)
-    if match is not None:
+    if QUERY_DECOMP_MARKER_RE.search(base) is None:
+        return out
+    for pattern, join_sides in QUERY_DECOMP_PATTERNS:
+        match = pattern.match(base)
+        if match is None:
+            continue
         left = (match.group("left") or "").strip()
         right = (match.group("right") or "").strip()
-        for sub in (left, right):
+        for sub in ((f"{left} {right}".strip(), right) if join_sides else (left, right)):
             if sub and sub not in out:
                 out.append(sub)
             if len(out) >= cap:
                 break
+        break
     return out[:cap]
 
 
@@ -3133,6 +3238,7 @@ def _run_find_pass_with_query_decomp_rrf(
     rrf_k = max(1, int(state.config.manual_find_query_decomp_rrf_k))
 
     merged_rows: dict[str, dict[str, Any]] = {}
+    base_scores_by_key: dict[str, float] = {}
     rrf_scores: dict[str, float] = {}
     scanned_files = 0
     scanned_nodes = 0
@@ -3180,7 +3286,9 @@ def _run_find_pass_with_query_decomp_rrf(
             key = _candidate_key(item)
             prev = merged_rows.get(key)
             if prev is None or _prefer_candidate(item, prev):
-                merged_rows[key] = dict(item)
+                # Sub-pass rows are fresh per call, so the merge can own them.
+                merged_rows[key] = item
+                base_scores_by_key[key] = _candidate_rank_score(item)
             rrf_scores[key] = rrf_scores.get(key, 0.0) + (1.0 / float(rrf_k + rank))
 
     if not merged_rows:
@@ -3198,17 +3306,15 @@ def _run_find_pass_with_query_decomp_rrf(
         return (*rows, False)
 
     rows_for_sort: list[dict[str, Any]] = []
-    base_scores_by_key: dict[str, float] = {}
-    for key, item in merged_rows.items():
-        base_scores_by_key[key] = _candidate_rank_score(item)
     base_min = min(base_scores_by_key.values(), default=0.0)
     base_max = max(base_scores_by_key.values(), default=0.0)
     rrf_min = min(rrf_scores.values(), default=0.0)
     rrf_max = max(rrf_scores.values(), default=0.0)
     base_weight = float(state.config.manual_find_query_decomp_base_weight)
+    alpha_explain = f"query_decomp_alpha={round(max(0.0, min(1.0, base_weight)), 4)}"
     for key, item in merged_rows.items():
-        rrf = float(rrf_scores.get(key, 0.0))
-        base_score = float(base_scores_by_key.get(key, 0.0))
+        rrf = float(rrf_scores[key])
+        base_score = float(base_scores_by_key[key])
         merged_score, base_norm, rrf_norm = _blend_query_decomp_rrf_score(
             base_score=base_score,
             rrf_score=rrf,
@@ -3225,24 +3331,17 @@ def _run_find_pass_with_query_decomp_rrf(
             score_lexical=merged_score,
             score_fused=merged_score,
         )
-        signals = set(item.get("signals") or [])
-        signals.add("query_decomp_rrf")
-        item["signals"] = sorted(signals)
-        ref = dict(item.get("ref") or {})
-        ref_signals = set(ref.get("signals") or [])
-        ref_signals.add("query_decomp_rrf")
-        ref["signals"] = sorted(ref_signals)
-        item["ref"] = ref
-        rank_explain = list(item.get("rank_explain") or [])
+        _add_candidate_signal(item, "query_decomp_rrf", shared=False)
+        rank_explain = item.get("rank_explain")
+        if not isinstance(rank_explain, list):
+            rank_explain = item["rank_explain"] = list(rank_explain or [])
         rank_explain.append(f"rrf={round(rrf, 6)}")
         rank_explain.append(f"base_norm={round(base_norm, 4)}")
         rank_explain.append(f"rrf_norm={round(rrf_norm, 4)}")
-        rank_explain.append(f"query_decomp_alpha={round(max(0.0, min(1.0, base_weight)), 4)}")
-        item["rank_explain"] = rank_explain
+        rank_explain.append(alpha_explain)
         rows_for_sort.append(item)
 
-    rows_for_sort.sort(key=_candidate_sort_key)
-    ordered = rows_for_sort[:max_candidates]
+    ordered = heapq.nsmallest(max_candidates, rows_for_sort, key=_candidate_sort_key)
     return (
         ordered,
         scanned_files,
@@ -3334,6 +3433,7 @@ def _merge_required_term_pass_rows(
     max_candidates: int,
 ) -> list[dict[str, Any]]:
     merged_rows: dict[str, dict[str, Any]] = {}
+    base_scores_by_key: dict[str, float] = {}
     rrf_scores: dict[str, float] = {}
     pass_labels_by_key: dict[str, str] = {}
     required_match_count_by_key: dict[str, int] = {}
@@ -3350,11 +3450,11 @@ def _merge_required_term_pass_rows(
     for pass_label, pass_weight, rows in pass_rows:
         pass_match_count = _required_match_count_from_pass_label(pass_label)
         for rank, item in enumerate(rows, start=1):
-            row = dict(item)
-            key = _candidate_key(row)
+            key = _candidate_key(item)
             prev = merged_rows.get(key)
-            if prev is None or _prefer_candidate(row, prev):
-                merged_rows[key] = row
+            if prev is None or _prefer_candidate(item, prev):
+                merged_rows[key] = item
+                base_scores_by_key[key] = _candidate_rank_score(item)
                 pass_labels_by_key[key] = pass_label
             required_match_count_by_key[key] = max(required_match_count_by_key.get(key, 1), pass_match_count)
             if "single_a" in pass_label or "single_b" in pass_label:
@@ -3365,16 +3465,16 @@ def _merge_required_term_pass_rows(
     if not merged_rows:
         return []
 
-    base_scores_by_key = {key: _candidate_rank_score(item) for key, item in merged_rows.items()}
     base_min = min(base_scores_by_key.values(), default=0.0)
     base_max = max(base_scores_by_key.values(), default=0.0)
     rrf_min = min(rrf_scores.values(), default=0.0)
     rrf_max = max(rrf_scores.values(), default=0.0)
+    alpha_explain = f"required_rrf_alpha={round(max(0.0, min(1.0, base_weight)), 4)}"
 
     rows_for_sort: list[dict[str, Any]] = []
     for key, item in merged_rows.items():
-        rrf = float(rrf_scores.get(key, 0.0))
-        base_score = float(base_scores_by_key.get(key, 0.0))
+        rrf = float(rrf_scores[key])
+        base_score = float(base_scores_by_key[key])
         merged_score, base_norm, rrf_norm = _blend_query_decomp_rrf_score(
             base_score=base_score,
             rrf_score=rrf,
@@ -3400,15 +3500,10 @@ def _merge_required_term_pass_rows(
             score_lexical=merged_score,
             score_fused=merged_score,
         )
-        signals = set(item.get("signals") or [])
-        signals.add("required_terms_rrf")
-        item["signals"] = sorted(signals)
-        ref = dict(item.get("ref") or {})
-        ref_signals = set(ref.get("signals") or [])
-        ref_signals.add("required_terms_rrf")
-        ref["signals"] = sorted(ref_signals)
-        item["ref"] = ref
-        rank_explain = list(item.get("rank_explain") or [])
+        _add_candidate_signal(item, "required_terms_rrf", shared=False)
+        rank_explain = item.get("rank_explain")
+        if not isinstance(rank_explain, list):
+            rank_explain = item["rank_explain"] = list(rank_explain or [])
         rank_explain.append(f"required_pass={pass_labels_by_key.get(key, 'single')}")
         rank_explain.append(f"required_match_count={required_match_count}")
         if required_match_bonus > 0.0:
@@ -3416,12 +3511,10 @@ def _merge_required_term_pass_rows(
         rank_explain.append(f"required_rrf={round(rrf, 6)}")
         rank_explain.append(f"required_base_norm={round(base_norm, 4)}")
         rank_explain.append(f"required_rrf_norm={round(rrf_norm, 4)}")
-        rank_explain.append(f"required_rrf_alpha={round(max(0.0, min(1.0, base_weight)), 4)}")
-        item["rank_explain"] = rank_explain
+        rank_explain.append(alpha_explain)
         rows_for_sort.append(item)
 
-    rows_for_sort.sort(key=_candidate_sort_key)
-    return rows_for_sort[:max_candidates]
+    return heapq.nsmallest(max_candidates, rows_for_sort, key=_candidate_sort_key)
 
 
 def _merge_required_unscanned_sections(pass_unscanned: list[list[dict[str, Any]]]) -> list[dict[str, Any]]:
@@ -3478,8 +3571,14 @@ def _run_find_pass_lexical(
     query_decomp_applied = False
     index_rebuilt = False
     index_docs = 0
+    started_at = time.monotonic()
 
     for pass_label, pass_terms, pass_weight in pass_plan:
+        # Passes share one time budget; later passes get whatever is left.
+        remaining_ms = budget_time_ms - int((time.monotonic() - started_at) * 1000)
+        if pass_rows and remaining_ms <= 0:
+            pass_cutoff_reasons.append("time_budget")
+            break
         (
             rows,
             scanned_files,
@@ -3497,7 +3596,7 @@ def _run_find_pass_lexical(
             manual_ids=manual_ids,
             query=query,
             max_stage=max_stage,
-            budget_time_ms=budget_time_ms,
+            budget_time_ms=max(1, remaining_ms),
             max_candidates=max_candidates,
             required_terms=pass_terms,
             allow_query_decomp=allow_query_decomp,
@@ -3803,12 +3902,11 @@ def _fuse_gate_runs_rrf(
         gate_weight_map[gate_label] = {"weight": round(float(weight), 4), "reason": reason}
         if weight <= 0.0:
             continue
-        for rank, item in enumerate(list(gate_run.get("candidates") or []), start=1):
-            row = dict(item)
-            key = _candidate_key(row)
+        for rank, item in enumerate(gate_run.get("candidates") or [], start=1):
+            key = _candidate_key(item)
             prev = merged_rows.get(key)
-            if prev is None or _prefer_candidate(row, prev):
-                merged_rows[key] = row
+            if prev is None or _prefer_candidate(item, prev):
+                merged_rows[key] = dict(item)
             contribution = float(weight) / float(max(1, int(GATE_FUSION_RRF_K)) + rank)
             rrf_scores[key] = rrf_scores.get(key, 0.0) + contribution
             contributions.setdefault(key, []).append(
@@ -3862,14 +3960,7 @@ def _fuse_gate_runs_rrf(
             score_lexical=merged_score,
             score_fused=merged_score,
         )
-        signals = set(row.get("signals") or [])
-        signals.add("gate_rrf")
-        row["signals"] = sorted(signals)
-        ref = dict(row.get("ref") or {})
-        ref_signals = set(ref.get("signals") or [])
-        ref_signals.add("gate_rrf")
-        ref["signals"] = sorted(ref_signals)
-        row["ref"] = ref
+        _add_candidate_signal(row, "gate_rrf", shared=True)
         rank_explain = list(row.get("rank_explain") or [])
         rank_explain.append(f"gate_rrf={round(rrf_score, 8)}")
         rank_explain.append(f"gate_base_norm={round(base_norm, 4)}")
@@ -4033,7 +4124,9 @@ def manual_find(
     )
     cache_scope_key: str | None = None
     cache_query: str | None = None
-    manuals_fp_lookup: str | None = None
+    # Computed at most once per call: the required-terms index and the
+    # semantic cache both key on the fingerprint of the selected manuals.
+    manuals_fp: str | None = None
     sem_cache_hit = False
     sem_cache_mode = "miss" if use_semantic_cache else "bypass"
     sem_cache_score: float | None = None
@@ -4055,10 +4148,10 @@ def manual_find(
     )
     if applied_required_terms:
         if required_terms_index is None:
-            required_terms_fp = _manuals_fingerprint(state, selected_manual_ids)
+            manuals_fp = _manuals_fingerprint(state, selected_manual_ids)
             required_terms_index, _ = state.sparse_index.get_or_build(
                 manual_ids=selected_manual_ids,
-                fingerprint=required_terms_fp,
+                fingerprint=manuals_fp,
             )
         required_terms_match_stats = _required_term_match_stats(
             required_terms=requested_required_terms,
@@ -4107,11 +4200,12 @@ def manual_find(
             required_terms=cache_required_terms,
         )
         cache_query = _cacheable_query(query)
-        manuals_fp_lookup = _manuals_fingerprint(state, cache_manual_ids)
+        if manuals_fp is None:
+            manuals_fp = _manuals_fingerprint(state, cache_manual_ids)
         exact_cached = state.semantic_cache.lookup_exact(
             scope_key=cache_scope_key,
             normalized_query=cache_query,
-            manuals_fingerprint=manuals_fp_lookup,
+            manuals_fingerprint=manuals_fp,
         )
         if exact_cached.hit:
             cached_trace_payload, source_latency_ms = _cached_trace_payload_and_source_latency(exact_cached.value)
@@ -4177,7 +4271,7 @@ def manual_find(
         semantic_cached = state.semantic_cache.lookup_semantic(
             scope_key=cache_scope_key,
             normalized_query=cache_query,
-            manuals_fingerprint=manuals_fp_lookup,
+            manuals_fingerprint=manuals_fp,
             sim_threshold=state.config.sem_cache_sim_threshold,
         )
         if semantic_cached.hit:
@@ -4521,22 +4615,19 @@ def manual_find(
                 if isinstance(item, dict)
             ):
                 next_actions.append(rewrite_retry_action)
-    evidences_by_id = {item["evidence_id"]: item for item in claim_graph.get("evidences", [])}
-    conflict_by_claim: dict[str, dict[str, Any]] = {}
-    gap_rows: list[dict[str, Any]] = []
-    while len(gap_rows) < summary["gap_count"]:
-        gap_rows.append(
-            {
-                "ref": None,
-                "path": None,
-                "start_line": None,
-                "reason": "gap",
-                "signals": [],
-                "score": None,
-                "conflict_with": [],
-                "gap_hint": "no candidates matched the current query scope",
-            }
-        )
+    gap_rows: list[dict[str, Any]] = [
+        {
+            "ref": None,
+            "path": None,
+            "start_line": None,
+            "reason": "gap",
+            "signals": [],
+            "score": None,
+            "conflict_with": [],
+            "gap_hint": "no candidates matched the current query scope",
+        }
+        for _ in range(summary["gap_count"])
+    ]
     _strip_internal_candidate_fields(candidates)
 
     trace_payload = {
@@ -4591,25 +4682,13 @@ def manual_find(
             }
             for item in unscanned
         ],
-        "conflicts": [
-            {
-                "ref": (evidences_by_id.get(edge["to_evidence_id"]) or {}).get("ref"),
-                "path": ((evidences_by_id.get(edge["to_evidence_id"]) or {}).get("ref") or {}).get("path"),
-                "start_line": ((evidences_by_id.get(edge["to_evidence_id"]) or {}).get("ref") or {}).get("start_line"),
-                "reason": "claim_conflict",
-                "signals": (evidences_by_id.get(edge["to_evidence_id"]) or {}).get("signals") or [],
-                "score": (evidences_by_id.get(edge["to_evidence_id"]) or {}).get("score"),
-                "conflict_with": [edge["from_claim_id"]],
-                "gap_hint": None,
-            }
-            for edge in conflict_by_claim.values()
-        ],
+        "conflicts": [],
         "gaps": gap_rows,
         "integrated_top": [
             {**item, "reason": "ranked_by_integration"}
             for item in candidates
         ],
-        "escalation_reasons": sorted(set(escalation_reasons)),
+        "escalation_reasons": list(dict.fromkeys(escalation_reasons)),
         "cutoff_reason": cutoff_reason,
     }
     trace_id = state.traces.create(trace_payload)
@@ -4638,7 +4717,7 @@ def manual_find(
         )
 
     if use_semantic_cache and cache_scope_key and cache_query:
-        manuals_fp_put = manuals_fp_lookup or _manuals_fingerprint(state, cache_manual_ids)
+        manuals_fp_put = manuals_fp or _manuals_fingerprint(state, cache_manual_ids)
         source_latency_ms = int((time.monotonic() - started_at) * 1000)
         state.semantic_cache.put(
             scope_key=cache_scope_key,
@@ -4763,15 +4842,22 @@ def manual_hits(
         rows = payload.get(mapped_key, [])
     shared_manual_id: str | None = None
     if applied_kind in {"candidates", "integrated_top"}:
-        manual_ids = {
-            str(((item.get("ref") or {}).get("manual_id")))
-            for item in rows
-            if (item.get("ref") or {}).get("manual_id")
-        }
-        shared_manual_id = next(iter(manual_ids)) if len(manual_ids) == 1 else None
+        for item in rows:
+            row_manual_id = (item.get("ref") or {}).get("manual_id")
+            if not row_manual_id:
+                continue
+            row_manual_id = str(row_manual_id)
+            if shared_manual_id is None:
+                shared_manual_id = row_manual_id
+            elif row_manual_id != shared_manual_id:
+                shared_manual_id = None
+                break
+    total = len(rows)
+    # Only the requested page is reshaped; total still counts every stored row.
+    sliced = rows[applied_offset : applied_offset + applied_limit]
     if applied_compact and applied_kind in {"candidates", "integrated_top"}:
         compact_rows: list[dict[str, Any]] = []
-        for item in rows:
+        for item in sliced:
             ref = dict(item.get("ref") or {})
             compact_ref: dict[str, Any] = {}
             if applied_kind == "integrated_top":
@@ -4795,10 +4881,10 @@ def manual_hits(
             if isinstance(matched_tokens, list) and matched_tokens:
                 compact_item["matched_tokens"] = matched_tokens
             compact_rows.append(compact_item)
-        rows = compact_rows
+        sliced = compact_rows
     elif applied_kind == "candidates":
         compact_rows = []
-        for item in rows:
+        for item in sliced:
             ref = dict(item.get("ref") or {})
             compact_ref: dict[str, Any] = {}
             if not shared_manual_id and ref.get("manual_id"):
@@ -4845,14 +4931,13 @@ def manual_hits(
             if gap_hint is not None:
                 compact_item["gap_hint"] = gap_hint
             compact_rows.append(compact_item)
-        rows = compact_rows
-    sliced = rows[applied_offset : applied_offset + applied_limit]
+        sliced = compact_rows
     out = {
         "trace_id": applied_trace_id,
         "kind": applied_kind,
         "offset": applied_offset,
         "limit": applied_limit,
-        "total": len(rows),
+        "total": total,
         "items": sliced,
     }
     if applied_kind == "candidates" and shared_manual_id:
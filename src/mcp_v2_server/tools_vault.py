@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import bisect
+import re
+import stat
 from pathlib import Path
 from typing import Any
 
@@ -15,6 +18,9 @@ from .state import AppState
 
 SCAN_MAX_CHARS = 12000
 VAULT_NOISE_FILES = {".ds_store", "thumbs.db", "desktop.ini"}
+# Line boundaries str.splitlines() honours besides "\n".
+NON_LF_LINE_BREAK_RE = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+VAULT_WRITE_CHUNK_CHARS = 64 * 1024
 
 
 def _parse_int_param(
@@ -61,31 +67,24 @@ def _normalize_scan_cursor(cursor: Any) -> dict[str, Any]:
     raise ToolError("invalid_parameter", "cursor must be an object (char_offset/start_line) or null")
 
 
-def _char_offset_from_line(text: str, line_no: int) -> int:
+def _char_offset_from_line(newline_offsets: list[int], line_no: int) -> int:
     if line_no <= 1:
         return 0
-    offset = 0
-    for _ in range(1, line_no):
-        next_break = text.find("\n", offset)
-        if next_break < 0:
-            raise ToolError("invalid_parameter", "start_line out of range")
-        offset = next_break + 1
-    return offset
+    if line_no - 2 >= len(newline_offsets):
+        raise ToolError("invalid_parameter", "start_line out of range")
+    return newline_offsets[line_no - 2] + 1
 
 
-def _line_from_char_offset(text: str, offset: int) -> int:
-    if not text:
-        return 1
-    bounded = min(max(0, offset), len(text))
-    return text.count("\n", 0, bounded) + 1
+def _line_from_char_offset(newline_offsets: list[int], offset: int, text_len: int) -> int:
+    bounded = min(max(0, offset), text_len)
+    return bisect.bisect_left(newline_offsets, bounded) + 1
 
 
-def _char_offset_after_line(text: str, line_no: int) -> int:
-    start = _char_offset_from_line(text, line_no)
-    next_break = text.find("\n", start)
-    if next_break < 0:
-        return len(text)
-    return next_break + 1
+def _char_offset_after_line(newline_offsets: list[int], line_no: int, text_len: int) -> int:
+    ensure(line_no - 2 < len(newline_offsets), "invalid_parameter", "start_line out of range")
+    if line_no - 1 >= len(newline_offsets):
+        return text_len
+    return newline_offsets[line_no - 1] + 1
 
 
 def _range_from_lines(total: int, range_obj: dict[str, Any] | None) -> tuple[int, int]:
@@ -107,19 +106,29 @@ def vault_read(
     full = _parse_bool_param(full, name="full", default=False)
     normalized = _normalize_path_param(path)
     file_path = resolve_inside_root(state.config.vault_root, normalized, must_exist=True)
-    ensure(file_path.is_file(), "not_found", "file not found", {"path": normalized})
+    stat_result = file_path.stat()
+    ensure(stat.S_ISREG(stat_result.st_mode), "not_found", "file not found", {"path": normalized})
 
     max_chars = 12000
-    text = file_path.read_text(encoding="utf-8")
-    lines = text.splitlines()
-    total = len(lines)
+    text, newline_offsets = state.vault_files.read(file_path, stat_result)
+    lines: list[str] | None = None
+    if NON_LF_LINE_BREAK_RE.search(text) is None:
+        total = len(newline_offsets) + (0 if not text or text.endswith("\n") else 1)
+    else:
+        lines = text.splitlines()
+        total = len(lines)
 
     if full:
         start_line, end_line = 1, max(1, total)
     else:
         start_line, end_line = _range_from_lines(max(1, total), range)
 
-    selected = "\n".join(lines[start_line - 1 : end_line])
+    if lines is None:
+        start_offset = _char_offset_from_line(newline_offsets, start_line)
+        end_offset = newline_offsets[end_line - 1] if end_line <= len(newline_offsets) else len(text)
+        selected = text[start_offset:end_offset]
+    else:
+        selected = "\n".join(lines[start_line - 1 : end_line])
     truncated_reason = "none"
     if len(selected) > max_chars:
         selected = selected[:max_chars]
@@ -127,7 +136,7 @@ def vault_read(
     elif not full and end_line < total:
         truncated_reason = "range_end"
 
-    next_cursor = None if end_line >= total else _char_offset_after_line(text, end_line)
+    next_cursor = None if end_line >= total else _char_offset_after_line(newline_offsets, end_line, len(text))
 
     return {
         "text": selected,
@@ -201,10 +210,21 @@ def vault_create(state: AppState, path: str, content: str) -> dict[str, Any]:
     normalized = _normalize_path_param(path)
     _enforce_vault_policy_on_create(state.config.vault_root, normalized)
     target = resolve_inside_root(state.config.vault_root, normalized, must_exist=False)
-    ensure(not target.exists(), "conflict", "file already exists", {"path": normalized})
     target.parent.mkdir(parents=True, exist_ok=True)
-    target.write_text(content, encoding="utf-8")
-    return {"written_path": normalized, "written_bytes": len(content.encode("utf-8"))}
+    try:
+        handle = open(target, "xb")
+    except FileExistsError:
+        raise ToolError("conflict", "file already exists", {"path": normalized})
+    written_bytes = 0
+    try:
+        with handle:
+            for start in range(0, len(content), VAULT_WRITE_CHUNK_CHARS):
+                written_bytes += handle.write(content[start : start + VAULT_WRITE_CHUNK_CHARS].encode("utf-8"))
+    except Exception:
+        target.unlink(missing_ok=True)
+        raise
+    state.vault_files.forget(target)
+    return {"written_path": normalized, "written_bytes": written_bytes}
 
 
 def vault_replace(state: AppState, path: str, find: str, replace: str, max_replacements: int | None = None) -> dict[str, Any]:
@@ -217,10 +237,17 @@ def vault_replace(state: AppState, path: str, find: str, replace: str, max_repla
     ensure(target.is_file(), "not_found", "target is not a file", {"path": normalized})
     data = target.read_text(encoding="utf-8")
     max_count = _parse_int_param(max_replacements, name="max_replacements", default=1, min_value=0)
-    total_hits = data.count(find)
-    count = min(total_hits, max_count)
+    if max_count == 0:
+        return {"written_path": normalized, "replacements": 0}
     new_data = data.replace(find, replace, max_count)
+    if len(find) != len(replace):
+        count = (len(data) - len(new_data)) // (len(find) - len(replace))
+    else:
+        count = min(data.count(find), max_count)
+    if count == 0:
+        return {"written_path": normalized, "replacements": 0}
     target.write_text(new_data, encoding="utf-8")
+    state.vault_files.forget(target)
     return {"written_path": normalized, "replacements": count}
 
 
@@ -232,7 +259,7 @@ def vault_scan(
 ) -> dict[str, Any]:
     normalized = _normalize_path_param(path)
     target = resolve_inside_root(state.config.vault_root, normalized, must_exist=True)
-    text = target.read_text(encoding="utf-8")
+    text, newline_offsets = state.vault_files.read(target, target.stat())
     max_chars = SCAN_MAX_CHARS
     normalized_cursor = _normalize_scan_cursor(cursor)
 
@@ -243,7 +270,7 @@ def vault_scan(
             default=1,
             min_value=1,
         )
-        applied_start_offset = _char_offset_from_line(text, parsed_start_line)
+        applied_start_offset = _char_offset_from_line(newline_offsets, parsed_start_line)
     elif normalized_cursor.get("char_offset") is not None:
         applied_start_offset = _parse_int_param(
             normalized_cursor.get("char_offset"),
@@ -258,18 +285,18 @@ def vault_scan(
             default=1,
             min_value=1,
         )
-        applied_start_offset = _char_offset_from_line(text, parsed_start_line)
+        applied_start_offset = _char_offset_from_line(newline_offsets, parsed_start_line)
     else:
         applied_start_offset = 0
 
     ensure(applied_start_offset <= len(text), "invalid_parameter", "cursor.char_offset out of range")
     end_offset = min(len(text), applied_start_offset + max_chars)
     chunk_text = text[applied_start_offset:end_offset]
-    start_line_no = _line_from_char_offset(text, applied_start_offset)
+    start_line_no = _line_from_char_offset(newline_offsets, applied_start_offset, len(text))
     if end_offset <= applied_start_offset:
         end_line_no = start_line_no
     else:
-        end_line_no = _line_from_char_offset(text, end_offset - 1)
+        end_line_no = _line_from_char_offset(newline_offsets, end_offset - 1, len(text))
 
     truncated_reason = "none" if end_offset >= len(text) else "max_chars"
     eof = end_offset >= len(text)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+import re
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+NEWLINE_RE = re.compile("\n")
+VAULT_FILE_CACHE_MAX_ITEMS = 64
+VAULT_FILE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Approximate size of one int object referenced from the offsets list.
+NEWLINE_OFFSET_INT_BYTES = 28
+
+
+@dataclass(frozen=True)
+class VaultFileEntry:
+    mtime_ns: int
+    size: int
+    text: str
+    newline_offsets: list[int]
+    cost_bytes: int
+
+
+def newline_offsets(text: str) -> list[int]:
+    return [match.start() for match in NEWLINE_RE.finditer(text)]
+
+
+def entry_cost_bytes(text: str, offsets: list[int]) -> int:
+    return sys.getsizeof(text) + sys.getsizeof(offsets) + len(offsets) * NEWLINE_OFFSET_INT_BYTES
+
+
+class VaultFileStore:
+    """Decoded vault text and newline index keyed by resolved path, reused until the file changes on disk."""
+
+    def __init__(
+        self,
+        max_items: int = VAULT_FILE_CACHE_MAX_ITEMS,
+        max_bytes: int = VAULT_FILE_CACHE_MAX_BYTES,
+    ) -> None:
+        self.max_items = max(1, int(max_items))
+        self.max_bytes = max(1, int(max_bytes))
+        self._items: OrderedDict[str, VaultFileEntry] = OrderedDict()
+        self._total_bytes = 0
+
+    def read(self, file_path: Path, stat_result: os.stat_result) -> tuple[str, list[int]]:
+        key = str(file_path)
+        cached = self._items.get(key)
+        if cached is not None and cached.mtime_ns == stat_result.st_mtime_ns and cached.size == stat_result.st_size:
+            self._items.move_to_end(key)
+            return cached.text, cached.newline_offsets
+        self.forget(file_path)
+
+        text = file_path.read_text(encoding="utf-8")
+        offsets = newline_offsets(text)
+        cost = entry_cost_bytes(text, offsets)
+        if cost <= self.max_bytes:
+            self._items[key] = VaultFileEntry(
+                mtime_ns=stat_result.st_mtime_ns,
+                size=stat_result.st_size,
+                text=text,
+                newline_offsets=offsets,
+                cost_bytes=cost,
+            )
+            self._total_bytes += cost
+            while len(self._items) > self.max_items or self._total_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._total_bytes -= evicted.cost_bytes
+        return text, offsets
+
+    def forget(self, file_path: Path) -> None:
+        evicted = self._items.pop(str(file_path), None)
+        if evicted is not None:
+            self._total_bytes -= evicted.cost_bytes
@@ -4,9 +4,11 @@ import json
 import time
 from dataclasses import replace
 from pathlib import PureWindowsPath
+from typing import Any
 
 import pytest
 
+import mcp_v2_server.sparse_index as sparse_index_module
 import mcp_v2_server.tools_manual as tools_manual_module
 from mcp_v2_server.adaptive_stats import AdaptiveStatsWriter
 from mcp_v2_server.config import Config
@@ -15,6 +17,7 @@ from mcp_v2_server.normalization import normalize_text
 from mcp_v2_server.path_guard import _is_subpath_casefold, normalize_relative_path
 from mcp_v2_server.reranker import RerankDiagnostics
 from mcp_v2_server.semantic_cache import SemanticCacheStore
+from mcp_v2_server.sparse_index import bm25_scores
 from mcp_v2_server.state import create_state
 from mcp_v2_server.tools_manual import manual_find as _manual_find_impl
 from mcp_v2_server.tools_manual import manual_hits, manual_ls, manual_read, manual_scan, manual_toc
@@ -508,6 +511,20 @@ def test_manual_scan_start_line_takes_precedence_over_cursor_char_offset(state)
     assert out["applied_range"]["start_line"] == 3
 
 
+def test_manual_scan_streams_start_line_across_read_chunks(state, monkeypatch) -> None:
+    monkeypatch.setattr(tools_manual_module, "SCAN_READ_CHUNK_CHARS", 7)
+    text = "".join(f"行{i}\r\n" for i in range(1, 40))
+    (state.config.manuals_root / "m1" / "crlf.md").write_bytes(text.encode("utf-8"))
+    out = manual_scan(state, manual_id="m1", path="crlf.md", start_line=30, max_chars=256)
+    assert out["text"].startswith("行30\n")
+    assert out["applied_range"] == {"start_line": 30, "end_line": 39}
+    assert out["eof"] is True
+
+    with pytest.raises(ToolError) as e:
+        manual_scan(state, manual_id="m1", path="crlf.md", start_line=41)
+    assert e.value.code == "invalid_parameter"
+
+
 def test_manual_find_rejects_non_boolean_expand_scope(state) -> None:
     with pytest.raises(ToolError) as e:
         manual_find(state, query="対象外", manual_id="m1", expand_scope="yes")
@@ -888,6 +905,28 @@ def test_query_decomp_subqueries_supports_vs_pattern() -> None:
     assert sub_queries == ["入院給付金 vs 通院給付金", "入院給付金", "通院給付金"]
 
 
+def test_add_candidate_signal_keeps_sorted_unique_lists_and_copies_shared_rows() -> None:
+    signals = ["exact", "phrase"]
+    ref = {"manual_id": "m1", "path": "a.md", "signals": ["exact", "phrase"]}
+    item = {"ref": ref, "signals": signals}
+
+    tools_manual_module._add_candidate_signal(item, "gate_rrf", shared=True)
+    tools_manual_module._add_candidate_signal(item, "gate_rrf", shared=True)
+
+    assert item["signals"] == ["exact", "gate_rrf", "phrase"]
+    assert item["ref"]["signals"] == ["exact", "gate_rrf", "phrase"]
+    assert signals == ["exact", "phrase"]
+    assert ref["signals"] == ["exact", "phrase"]
+
+    owned_ref = {"manual_id": "m1", "path": "b.md", "signals": ["exact"]}
+    owned = {"ref": owned_ref, "signals": ["exact"]}
+    tools_manual_module._add_candidate_signal(owned, "query_decomp_rrf", shared=False)
+
+    assert owned["ref"] is owned_ref
+    assert owned_ref["signals"] == ["exact", "query_decomp_rrf"]
+    assert owned["signals"] == ["exact", "query_decomp_rrf"]
+
+
 def test_manual_find_applies_query_decomp_rrf_signal_when_enabled(state, monkeypatch) -> None:
     monkeypatch.setenv("MANUAL_FIND_QUERY_DECOMP_ENABLED", "true")
     monkeypatch.setenv("MANUAL_FIND_QUERY_DECOMP_MAX_SUB_QUERIES", "3")
@@ -1071,6 +1110,36 @@ def test_manual_find_query_decomp_falls_back_when_all_subqueries_fail(state, mon
     assert "exact" in ((hits["items"][0].get("ref") or {}).get("signals") or [])
 
 
+def test_run_find_pass_lexical_required_passes_share_time_budget(state, monkeypatch) -> None:
+    clock = [100.0]
+    budgets: list[int] = []
+
+    def fake_single(*args, **kwargs):
+        budgets.append(kwargs["budget_time_ms"])
+        clock[0] += 0.5
+        return ([], 1, 1, 0, None, [], False, 1, False, "lexical", None)
+
+    monkeypatch.setattr(tools_manual_module.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(tools_manual_module, "_run_find_pass_lexical_single", fake_single)
+    rows, *_, cutoff_reason, _unscanned, _rebuilt, _docs, _decomp, scoring_mode, _fallback = (
+        tools_manual_module._run_find_pass_lexical(
+            state,
+            manual_ids=["m1"],
+            query="対象外",
+            max_stage=4,
+            budget_time_ms=1000,
+            max_candidates=10,
+            required_terms=["対象外", "手順"],
+            allow_query_decomp=False,
+        )
+    )
+
+    assert rows == []
+    assert budgets == [1000, 500]
+    assert cutoff_reason == "time_budget"
+    assert scoring_mode == "required_terms_rrf"
+
+
 def test_manual_find_rejects_non_integer_budget_time_ms(state) -> None:
     with pytest.raises(ToolError) as e:
         manual_find(state, query="対象外", manual_id="m1", budget={"time_ms": "abc"})
@@ -1427,6 +1496,23 @@ def test_manual_hits_candidates_compact_minimizes_fields(state) -> None:
     assert "signals" not in first["ref"]
 
 
+def test_manual_hits_candidates_paginates_before_reshaping_rows(state) -> None:
+    out = manual_find(state, query="対象外", manual_id="m1")
+    full = manual_hits(state, trace_id=out["trace_id"], kind="candidates", limit=50)
+    assert full["total"] >= 2
+
+    page = manual_hits(state, trace_id=out["trace_id"], kind="candidates", offset=1, limit=1)
+    assert page["total"] == full["total"]
+    assert page["items"] == full["items"][1:2]
+    assert page["manual_id"] == "m1"
+
+    compact_page = manual_hits(state, trace_id=out["trace_id"], kind="candidates", offset=1, limit=1, compact=True)
+    assert compact_page["total"] == full["total"]
+    assert compact_page["items"][0]["ref"] == {
+        key: value for key, value in full["items"][1]["ref"].items() if key in {"path", "start_line"}
+    }
+
+
 def test_manual_hits_integrated_top_compact_minimizes_fields(state) -> None:
     out = manual_find(state, query="対象外", manual_id="m1")
     hits = manual_hits(state, trace_id=out["trace_id"], kind="integrated_top", limit=1, compact=True)
@@ -1485,6 +1571,32 @@ def test_candidate_sort_key_breaks_score_ties_by_token_hits() -> None:
     assert ordered[0] is stronger
 
 
+def test_upsert_candidate_with_file_cap_evicts_worst_row() -> None:
+    def row(start_line: int, score: float) -> dict[str, Any]:
+        return {
+            "ref": {"manual_id": "m1", "path": "a.md", "start_line": start_line},
+            "path": "a.md",
+            "start_line": start_line,
+            "score": score,
+        }
+
+    candidates: dict[str, dict[str, Any]] = {}
+    file_candidate_keys: dict[tuple[str, str], set[str]] = {}
+    sort_keys: dict[str, Any] = {}
+    for start_line, score in [(1, 3.0), (2, 1.0), (3, 2.0), (4, 0.5)]:
+        tools_manual_module._upsert_candidate_with_file_cap(
+            candidates=candidates,
+            file_candidate_keys=file_candidate_keys,
+            file_key=("m1", "a.md"),
+            candidate_row=row(start_line, score),
+            per_file_cap=2,
+            sort_keys=sort_keys,
+        )
+
+    assert sorted(candidates) == ["m1|a.md|1", "m1|a.md|3"]
+    assert set(sort_keys) == set(candidates)
+
+
 def test_effective_scan_hard_cap_scales_with_budget() -> None:
     assert tools_manual_module._effective_scan_hard_cap(5000, 1) == 50
     assert tools_manual_module._effective_scan_hard_cap(5000, 200) == 4000
@@ -1628,6 +1740,12 @@ def test_segment_query_term_avoids_artificial_cjk_fragments() -> None:
     assert "一覧" in tokens
 
 
+def test_min_distance_matches_pairwise_minimum_for_unsorted_positions() -> None:
+    assert tools_manual_module._min_distance([120, 5, 64], [70, 300, 1]) == 4
+    assert tools_manual_module._min_distance([10, 40], [40]) == 0
+    assert tools_manual_module._min_distance([], [3]) is None
+
+
 def test_segment_query_term_splits_short_no_phrase() -> None:
     tokens = tools_manual_module._segment_query_term("抗がん剤の給付")
     assert "抗がん剤" in tokens
@@ -1700,6 +1818,32 @@ def test_prf_expand_terms_uses_corpus_context_without_synonym_dictionary(state)
     assert all(":" not in term and "-" not in term and "|" not in term for term in expanded)
 
 
+def test_bm25_scores_reuses_cached_scores_without_sharing_dicts(state) -> None:
+    manuals_fp = tools_manual_module._manuals_fingerprint(state, ["m1"])
+    sparse_index, _ = state.sparse_index.get_or_build(manual_ids=["m1"], fingerprint=manuals_fp)
+    query_terms = set(sparse_index.postings)
+
+    first = bm25_scores(sparse_index, query_terms=query_terms)
+    first.clear()
+    second = bm25_scores(sparse_index, query_terms=query_terms)
+
+    assert second
+    assert second == bm25_scores(sparse_index, query_terms=set(query_terms))
+    assert len(sparse_index.memo["bm25_scores"]) == 1
+
+
+def test_bm25_scores_cache_is_bounded_by_total_score_entries(state, monkeypatch) -> None:
+    manuals_fp = tools_manual_module._manuals_fingerprint(state, ["m1"])
+    sparse_index, _ = state.sparse_index.get_or_build(manual_ids=["m1"], fingerprint=manuals_fp)
+    terms = sorted(term for term, postings in sparse_index.postings.items() if len(postings) == 1)[:3]
+    monkeypatch.setattr(sparse_index_module, "BM25_SCORES_CACHE_MAX_ENTRIES", 2)
+
+    for term in terms:
+        assert len(bm25_scores(sparse_index, query_terms={term})) == 1
+
+    assert [set(key[0]) for key in sparse_index.memo["bm25_scores"]] == [{terms[1]}, {terms[2]}]
+
+
 def test_manual_find_boosts_code_exact_match(state) -> None:
     manual_dir = state.config.manuals_root / "m12"
     manual_dir.mkdir(parents=True, exist_ok=True)
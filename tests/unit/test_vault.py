@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 import pytest
 
 from mcp_v2_server.app import _execute
+from mcp_v2_server import tools_vault as tools_vault_module
 from mcp_v2_server.errors import ToolError
 from mcp_v2_server.tools_vault import (
     vault_create,
@@ -11,6 +14,7 @@ from mcp_v2_server.tools_vault import (
     vault_replace,
     vault_scan,
 )
+from mcp_v2_server.vault_file_store import VaultFileStore, entry_cost_bytes, newline_offsets
 
 
 def test_vault_read_requires_range_when_not_full(state) -> None:
@@ -266,3 +270,96 @@ def test_execute_allows_vault_tools_without_vault_ls(state) -> None:
         path="source.md",
     )
     assert out["path"] == "source.md"
+
+
+def test_vault_read_slices_line_range_without_splitting_whole_file(state) -> None:
+    (state.config.vault_root / "mixed.md").write_text("a\n\nb\nc", encoding="utf-8")
+    out = vault_read(state, path="mixed.md", full=False, range={"start_line": 2, "end_line": 3})
+    assert out["text"] == "\nb"
+    assert out["next_cursor"]["char_offset"] == 5
+
+    (state.config.vault_root / "crlf.md").write_bytes(b"a\r\nb\r\nc\r\n")
+    out = vault_read(state, path="crlf.md", full=True)
+    assert out["text"] == "a\nb\nc"
+    assert out["applied_range"] == {"start_line": 1, "end_line": 3}
+
+
+def test_vault_scan_line_index_is_refreshed_after_same_size_replace(state) -> None:
+    first = vault_scan(state, path="source.md", start_line=3)
+    assert first["text"] == "line3\nline4\nline5\n"
+
+    vault_replace(state, path="source.md", find="1\n", replace="1 ")
+    second = vault_scan(state, path="source.md", start_line=3)
+    assert second["text"] == "line4\nline5\n"
+    assert second["applied_range"] == {"start_line": 3, "end_line": 4}
+
+
+def test_vault_scan_reuses_cached_text_until_file_changes(state, monkeypatch) -> None:
+    first = vault_scan(state, path="source.md")
+
+    def _fail_read_text(self, *args, **kwargs):
+        raise AssertionError("unexpected re-read")
+
+    monkeypatch.setattr(type(state.config.vault_root), "read_text", _fail_read_text)
+    assert vault_scan(state, path="source.md")["text"] == first["text"]
+
+    monkeypatch.undo()
+    (state.config.vault_root / "source.md").write_text("changed\n", encoding="utf-8")
+    assert vault_scan(state, path="source.md")["text"] == "changed\n"
+
+
+def test_vault_replace_counts_replacements_from_length_delta(state) -> None:
+    out = vault_replace(state, path="source.md", find="line", replace="L", max_replacements=3)
+    assert out["replacements"] == 3
+    out = vault_replace(state, path="source.md", find="L", replace="M", max_replacements=10)
+    assert out["replacements"] == 3
+    assert (state.config.vault_root / "source.md").read_text(encoding="utf-8") == "M1\nM2\nM3\nline4\nline5\n"
+    assert vault_replace(state, path="source.md", find="M", replace="", max_replacements=0)["replacements"] == 0
+
+
+def test_vault_create_writes_encoded_bytes_once_and_rejects_existing_file(state) -> None:
+    out = vault_create(state, path="project-a/new.md", content="é\n")
+    assert out == {"written_path": "project-a/new.md", "written_bytes": 3}
+    assert (state.config.vault_root / "project-a" / "new.md").read_bytes() == "é\n".encode("utf-8")
+
+    with pytest.raises(ToolError) as e:
+        vault_create(state, path="project-a/new.md", content="again")
+    assert e.value.code == "conflict"
+
+
+def test_vault_create_streams_content_in_chunks_and_cleans_up_on_encode_error(state, monkeypatch) -> None:
+    monkeypatch.setattr(tools_vault_module, "VAULT_WRITE_CHUNK_CHARS", 3)
+    content = "あいうえおabc\n"
+    out = vault_create(state, path="project-a/chunked.md", content=content)
+    assert out["written_bytes"] == len(content.encode("utf-8"))
+    assert (state.config.vault_root / "project-a" / "chunked.md").read_text(encoding="utf-8") == content
+
+    with pytest.raises(UnicodeEncodeError):
+        vault_create(state, path="project-a/broken.md", content="abcdef\ud800")
+    assert not (state.config.vault_root / "project-a" / "broken.md").exists()
+
+
+def test_vault_replace_skips_write_when_nothing_matches(state, monkeypatch) -> None:
+    def _fail_write_text(self, *args, **kwargs):
+        raise AssertionError("unexpected write")
+
+    monkeypatch.setattr(type(state.config.vault_root), "write_text", _fail_write_text)
+    out = vault_replace(state, path="source.md", find="missing", replace="x", max_replacements=5)
+    assert out == {"written_path": "source.md", "replacements": 0}
+    out = vault_replace(state, path="source.md", find="nope", replace="abcd")
+    assert out["replacements"] == 0
+
+
+def test_vault_file_store_charges_newline_index_and_evicts_oldest_entries(state) -> None:
+    entry_cost = entry_cost_bytes("x\n" * 9, newline_offsets("x\n" * 9))
+    assert entry_cost > len("x\n" * 9) * 2
+    state.vault_files = VaultFileStore(max_bytes=entry_cost * 2)
+    for name in ("a.md", "b.md", "c.md"):
+        (state.config.vault_root / name).write_text("x\n" * 9, encoding="utf-8")
+        vault_scan(state, path=name)
+    assert [Path(key).name for key in state.vault_files._items] == ["b.md", "c.md"]
+
+    (state.config.vault_root / "b.md").write_text("x\n" * 200, encoding="utf-8")
+    assert vault_scan(state, path="b.md")["applied_range"]["end_line"] == 200
+    assert [Path(key).name for key in state.vault_files._items] == ["c.md"]
+    assert state.vault_files._total_bytes == entry_cost